@@ -8,40 +8,81 @@ Maximum Subarray Sum Problem - Three Algorithm Implementations and Performance C
 1. 暴力枚举 (Brute Force Enumeration)
 2. 优化枚举 (Optimized Enumeration) 
 3. 动态规划 (Dynamic Programming - Kadane's Algorithm)
+4. NumPy前缀和 (Vectorized NumPy Prefix Sums) - 支持二维批量求解 (with 2-D batch API)
+5. 并行分治 (Parallel Divide and Conquer over shared memory)
+6. 流式处理 (Streaming over np.memmap / chunk iterators)
+7. 滑动窗口线段树 (Sliding-window segment tree for live feeds)
+8. 扩展问题: 环形、前 k 个不相交、二维最大子矩阵 (Circular, k-best disjoint, 2-D submatrix)
+
+算法部分只依赖标准库和 NumPy；matplotlib / seaborn / tqdm 在首次绘图或显示进度条时才导入。
+(The compute core needs only the standard library and NumPy; plotting libraries load lazily.)
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import seaborn as sns
 import time
 import random
-from tqdm import tqdm
 import platform
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable
 import warnings
 import os
+import argparse
+import csv
+import json
+import math
+import statistics
+import functools
+import gc
+import heapq
+import sys
+import subprocess
+from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 warnings.filterwarnings('ignore')
 
-try:
-    import matplotlib
-    matplotlib.font_manager._rebuild()
-except:
-    pass
+# matplotlib / seaborn / tqdm 只在第一次绘图或显示进度条时导入，
+# 纯算法调用只依赖标准库和 NumPy (plotting and progress libraries are imported lazily)
+_plotting_modules = None
+
+
+def _load_plotting():
+    """首次使用时导入 matplotlib 与 seaborn 并设置全局字体 (Import plotting libraries on first use)"""
+    global _plotting_modules
+    if _plotting_modules is None:
+        import matplotlib
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        try:
+            matplotlib.font_manager._rebuild()
+        except:
+            pass
+        
+        # 方法1：设置全局字体
+        plt.rcParams["font.family"] = ["SimHei", "Microsoft YaHei", "WenQuanYi Micro Hei", "Heiti TC", "DejaVu Sans"]
+        # 解决负号显示问题
+        plt.rcParams['axes.unicode_minus'] = False
+        plt.rcParams['font.size'] = 10
+        _plotting_modules = (plt, sns)
+    return _plotting_modules
+
+
+def _load_tqdm():
+    """首次显示进度条时导入 tqdm (Import tqdm on first use)"""
+    from tqdm import tqdm
+    return tqdm
 
-# 方法1：设置全局字体
-plt.rcParams["font.family"] = ["SimHei", "Microsoft YaHei", "WenQuanYi Micro Hei", "Heiti TC", "DejaVu Sans"]
-# 解决负号显示问题
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['font.size'] = 10
 
 class FontManager:
     
     def __init__(self):
+        self.plt, self.sns = _load_plotting()
         self._configure_matplotlib()
     
     def _configure_matplotlib(self):
         """配置matplotlib字体设置 (Configure matplotlib font settings)"""
+        plt, sns = self.plt, self.sns
         # 设置seaborn样式（这可能会重置字体）
         sns.set_style("whitegrid")
         sns.set_palette("husl")
@@ -52,13 +93,364 @@ class FontManager:
         plt.rcParams['font.size'] = 10
         
 
+# ---------------------------------------------------------------------------
+# 低开销计时与结果输出 (Low-overhead timing hooks and result sinks)
+# ---------------------------------------------------------------------------
+
+# 进度条按批次刷新，避免在最内层循环里调用 tqdm (progress is reported in coarse batches)
+PROGRESS_BATCH = 1 << 16
+
+
+class JSONSink:
+    """把计时记录写成 JSON 数组文件 (Write timing records to a JSON file)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.records = []
+    
+    def emit(self, record: Dict[str, Any]):
+        self.records.append(record)
+    
+    def close(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+
+
+class CSVSink:
+    """把计时记录逐行追加到 CSV 文件 (Append timing records to a CSV file)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._writer = None
+    
+    def emit(self, record: Dict[str, Any]):
+        if self._writer is None:
+            is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, 'a', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=list(record.keys()), extrasaction='ignore')
+            if is_new:
+                self._writer.writeheader()
+        self._writer.writerow(record)
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+class PerfTimer:
+    """
+    基于 perf_counter_ns 的计时器 (Timer based on time.perf_counter_ns)
+    既可作为上下文管理器，也可作为装饰器使用；每次计时结束后把记录发送到所有 sink。
+    
+        with PerfTimer("kadane", sinks=[CSVSink("t.csv")]) as t:
+            algorithms.dynamic_programming(arr, show_progress=False)
+        print(t.elapsed_ns)
+    """
+    
+    def __init__(self, name: str, sinks: List = None, **tags):
+        self.name = name
+        self.sinks = sinks or []
+        self.tags = tags
+        self.elapsed_ns = None
+        self._start = None
+    
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed_ns = time.perf_counter_ns() - self._start
+        if exc_type is None:
+            record = {'name': self.name, 'elapsed_ns': self.elapsed_ns}
+            record.update(self.tags)
+            for sink in self.sinks:
+                sink.emit(record)
+        return False
+    
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PerfTimer(self.name, self.sinks, **self.tags):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def measure(func, *args, name: str = None, warmup: int = 1, repeat: int = 5,
+            sinks: List = None, tags: Dict[str, Any] = None, keep_samples: bool = False,
+            **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """
+    预热后重复运行 func 并统计耗时 (Warm up, then time repeated runs of func)
+    返回 (最后一次运行的结果, 统计记录)；统计记录包含 median / p95 / min / max（纳秒），
+    并会发送到所有 sink。keep_samples=True 时记录中额外保留全部原始样本 samples_ns。
+    """
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    
+    record = {
+        'name': name or getattr(func, '__name__', str(func)),
+        'warmup': warmup,
+        'repeat': repeat,
+        'median_ns': int(statistics.median(samples)),
+        # p95 使用最近秩法 (nearest-rank)
+        'p95_ns': samples[max(0, math.ceil(0.95 * len(samples)) - 1)],
+        'min_ns': samples[0],
+        'max_ns': samples[-1],
+    }
+    if tags:
+        record.update(tags)
+    if keep_samples:
+        record['samples_ns'] = samples
+    for sink in sinks or []:
+        sink.emit(record)
+    return result, record
+
+
+# ---------------------------------------------------------------------------
+# 并行分治所需的模块级函数（需可被 pickle 传给子进程）
+# Module-level helpers for the parallel divide-and-conquer engine (must be picklable)
+# ---------------------------------------------------------------------------
+
+# 区块摘要 (chunk summary):
+# (total, (prefix_sum, prefix_end), (suffix_sum, suffix_start), (best_sum, best_start, best_end))
+# 所有下标均为全局下标；并列时取结束位置最早、起点最早者，与 Kadane 的选择规则一致。
+
+def _summarize_segment(seg: np.ndarray, offset: int) -> Tuple:
+    """计算一段数组的 (总和, 最大前缀, 最大后缀, 最大子数组) 摘要 (Summarize one chunk)"""
+    prefix = np.empty(seg.shape[0] + 1, dtype=np.result_type(seg.dtype, np.int64))
+    prefix[0] = 0
+    np.cumsum(seg, out=prefix[1:])
+    total = prefix[-1].item()
+    
+    # 最大前缀: max P[j+1]，取最早的 j
+    p_end = int(np.argmax(prefix[1:]))
+    best_prefix = (prefix[p_end + 1].item(), offset + p_end)
+    
+    # 最大后缀: total - min P[k]，取最早的 k
+    s_start = int(np.argmin(prefix[:-1]))
+    best_suffix = (total - prefix[s_start].item(), offset + s_start)
+    
+    # 段内最大子数组: 前缀和 + 前缀最小值
+    gains = prefix[1:] - np.minimum.accumulate(prefix[:-1])
+    b_end = int(np.argmax(gains))
+    b_start = int(np.argmin(prefix[:b_end + 1]))
+    best = (gains[b_end].item(), offset + b_start, offset + b_end)
+    return total, best_prefix, best_suffix, best
+
+
+def _chunk_summary(shm_name: str, dtype: str, n: int, lo: int, hi: int) -> Tuple:
+    """子进程入口：挂载共享内存并归约 arr[lo:hi] (Worker: attach shared memory and reduce a chunk)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arr = np.ndarray((n,), dtype=np.dtype(dtype), buffer=shm.buf)
+    try:
+        return _summarize_segment(arr[lo:hi], lo)
+    finally:
+        # 先释放 ndarray 对缓冲区的引用，否则 close() 会报 BufferError
+        del arr
+        shm.close()
+
+
+class SharedArray:
+    """
+    共享内存中的一维数组 (1-D array backed by multiprocessing.shared_memory)
+    
+    由调用者持有：构造时把数据拷贝一次 (O(n)，在主进程中串行执行)，之后可以反复传给
+    parallel_divide_conquer，子进程按名称挂载，每次调用不再有 O(n) 的拷贝。
+    array 为可写的 ndarray 视图，可以原地更新数据；用完后调用 close() 或使用 with 语句释放共享内存。
+    """
+    
+    def __init__(self, arr):
+        a = np.ascontiguousarray(arr)
+        if a.ndim != 1:
+            raise ValueError("SharedArray 只支持一维数组 (SharedArray must be 1-D)")
+        # 长度为 0 的共享内存无法创建，至少申请 1 字节
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, a.nbytes))
+        self.array = np.ndarray(a.shape, dtype=a.dtype, buffer=self._shm.buf)
+        self.array[:] = a
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    def close(self):
+        if self._shm is None:
+            return
+        # 先释放 ndarray 对缓冲区的引用，否则 close() 会报 BufferError
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _merge_summaries(left: Tuple, right: Tuple) -> Tuple:
+    """合并相邻两段的摘要 (Merge the summaries of two adjacent chunks)"""
+    l_total, l_prefix, l_suffix, l_best = left
+    r_total, r_prefix, r_suffix, r_best = right
+    
+    total = l_total + r_total
+    
+    # 前缀可以停在左段内，也可以跨过整个左段；并列时保留更早的结束位置
+    spanning_prefix = (l_total + r_prefix[0], r_prefix[1])
+    best_prefix = l_prefix if l_prefix[0] >= spanning_prefix[0] else spanning_prefix
+    
+    # 后缀可以从右段开始，也可以从左段开始并覆盖整个右段；并列时保留更早的起点
+    spanning_suffix = (l_suffix[0] + r_total, l_suffix[1])
+    best_suffix = spanning_suffix if spanning_suffix[0] >= r_suffix[0] else r_suffix
+    
+    # 最优解在左段、右段或跨越边界；并列时结束位置更早者优先，其次起点更早者优先
+    crossing = (l_suffix[0] + r_prefix[0], l_suffix[1], r_prefix[1])
+    best = max((l_best, crossing, r_best), key=lambda c: (c[0], -c[2], -c[1]))
+    return total, best_prefix, best_suffix, best
+
+
+class SlidingWindowMaxSubarray:
+    """
+    滑动窗口最大子数组和 - 数组实现的线段树 (Sliding-Window Max Subarray - Array-backed Segment Tree)
+    
+    窗口中的元素按环形缓冲区存放在叶子上，每个节点保存 (sum, prefix, suffix, best) 四个值，
+    分别存放在四个平行的列表中，不创建节点对象。
+    时间复杂度: update / append / popleft / query 均为 O(log W)
+    空间复杂度: O(W)
+    """
+    
+    _NEG_INF = float('-inf')
+    
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity 必须为正数 (capacity must be positive)")
+        self._capacity = capacity
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._n = size              # 叶子个数（2 的幂），也是环形缓冲区的长度
+        self._head = 0              # 最早元素所在的叶子位置
+        self._len = 0
+        # 空叶子为单位元: sum = 0, prefix / suffix / best = -inf（子数组非空）
+        self._sum = [0] * (2 * size)
+        self._pre = [self._NEG_INF] * (2 * size)
+        self._suf = [self._NEG_INF] * (2 * size)
+        self._best = [self._NEG_INF] * (2 * size)
+    
+    def __len__(self):
+        return self._len
+    
+    def _set_leaf(self, pos: int, value, empty: bool = False):
+        """设置叶子并自底向上更新祖先节点 (Set a leaf and refresh its ancestors)"""
+        s, pre, suf, best = self._sum, self._pre, self._suf, self._best
+        x = pos + self._n
+        if empty:
+            s[x], pre[x], suf[x], best[x] = 0, self._NEG_INF, self._NEG_INF, self._NEG_INF
+        else:
+            s[x] = pre[x] = suf[x] = best[x] = value
+        x >>= 1
+        while x:
+            l, r = 2 * x, 2 * x + 1
+            s[x] = s[l] + s[r]
+            pre[x] = max(pre[l], s[l] + pre[r])
+            suf[x] = max(suf[r], s[r] + suf[l])
+            best[x] = max(best[l], best[r], suf[l] + pre[r])
+            x >>= 1
+    
+    def _physical(self, i: int) -> int:
+        if i < 0 or i >= self._len:
+            raise IndexError("索引越界 (index out of range)")
+        return (self._head + i) % self._n
+    
+    def get(self, i: int):
+        return self._sum[self._physical(i) + self._n]
+    
+    def update(self, i: int, value):
+        """单点修改窗口中第 i 个元素 (Point update of the i-th element in the window)"""
+        self._set_leaf(self._physical(i), value)
+    
+    def append(self, value):
+        """在窗口尾部追加元素；窗口已满时自动移除最早的元素 (Append; evicts the oldest when full)"""
+        if self._len == self._capacity:
+            self.popleft()
+        self._set_leaf((self._head + self._len) % self._n, value)
+        self._len += 1
+    
+    def popleft(self):
+        """移除并返回窗口中最早的元素 (Remove and return the oldest element)"""
+        if self._len == 0:
+            raise IndexError("窗口为空 (window is empty)")
+        value = self._sum[self._head + self._n]
+        self._set_leaf(self._head, None, empty=True)
+        self._head = (self._head + 1) % self._n
+        self._len -= 1
+        return value
+    
+    def _query_physical(self, lo: int, hi: int) -> Tuple:
+        """查询叶子区间 [lo, hi) 的 (sum, prefix, suffix, best) (Query physical leaf range)"""
+        s, pre, suf, best = self._sum, self._pre, self._suf, self._best
+        neg = self._NEG_INF
+        # 左右两侧分别累积，合并时保持从左到右的顺序
+        ls, lp, lx, lb = 0, neg, neg, neg
+        rs, rp, rx, rb = 0, neg, neg, neg
+        lo += self._n
+        hi += self._n
+        while lo < hi:
+            if lo & 1:
+                ls, lp, lx, lb = (ls + s[lo], max(lp, ls + pre[lo]), max(suf[lo], s[lo] + lx),
+                                  max(lb, best[lo], lx + pre[lo]))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                rs, rp, rx, rb = (s[hi] + rs, max(pre[hi], s[hi] + rp), max(rx, rs + suf[hi]),
+                                  max(best[hi], rb, suf[hi] + rp))
+            lo >>= 1
+            hi >>= 1
+        return (ls + rs, max(lp, ls + rp), max(rx, rs + lx), max(lb, rb, lx + rp))
+    
+    def query(self, l: int = 0, r: int = None):
+        """
+        窗口区间 [l, r) 内的最大子数组和 (Maximum subarray sum of window[l:r])
+        区间在环形缓冲区中可能跨越末尾，此时拆成两段按顺序合并。
+        """
+        if r is None:
+            r = self._len
+        if l < 0 or r > self._len or l >= r:
+            raise IndexError("查询区间不合法 (invalid query range)")
+        lo = (self._head + l) % self._n
+        hi = lo + (r - l)
+        if hi <= self._n:
+            return self._query_physical(lo, hi)[3]
+        a_sum, a_pre, a_suf, a_best = self._query_physical(lo, self._n)
+        b_sum, b_pre, b_suf, b_best = self._query_physical(0, hi - self._n)
+        return max(a_best, b_best, a_suf + b_pre)
+
+
 class MaxSubarrayAlgorithms:
     """最大子数组和算法集合 (Maximum Subarray Sum Algorithms Collection)"""
     
     def __init__(self):
-        self.font_manager = FontManager()
+        self._font_manager = None
         self.results = {}
     
+    @property
+    def font_manager(self) -> FontManager:
+        """绘图时才创建 FontManager，避免导入 matplotlib (Created lazily on first plot)"""
+        if self._font_manager is None:
+            self._font_manager = FontManager()
+        return self._font_manager
+    
     def brute_force(self, arr: List[int], show_progress: bool = True) -> Tuple[int, int, int]:
         """
         暴力枚举算法 (Brute Force Algorithm)
@@ -74,13 +466,11 @@ class MaxSubarrayAlgorithms:
         total_iterations = n * (n + 1) // 2
         
         if show_progress:
-            pbar = tqdm(total=total_iterations, 
+            pbar = _load_tqdm()(total=total_iterations, 
                        desc="暴力枚举 (Brute Force)", 
                        unit="iter",
                        ncols=80)
         
-        iteration_count = 0
-        
         # 枚举所有可能的子数组
         for i in range(n):
             for j in range(i, n):
@@ -94,10 +484,10 @@ class MaxSubarrayAlgorithms:
                     max_sum = current_sum
                     start_idx = i
                     end_idx = j
-                
-                iteration_count += 1
-                if show_progress:
-                    pbar.update(1)
+            
+            # 每个起点结束后批量刷新进度，而不是在最内层循环中逐次刷新
+            if show_progress:
+                pbar.update(n - i)
         
         if show_progress:
             pbar.close()
@@ -119,13 +509,11 @@ class MaxSubarrayAlgorithms:
         total_iterations = n * (n + 1) // 2
         
         if show_progress:
-            pbar = tqdm(total=total_iterations, 
+            pbar = _load_tqdm()(total=total_iterations, 
                        desc="优化枚举 (Optimized Enum)", 
                        unit="iter",
                        ncols=80)
         
-        iteration_count = 0
-        
         # 枚举所有可能的起始位置
         for i in range(n):
             current_sum = 0
@@ -138,10 +526,10 @@ class MaxSubarrayAlgorithms:
                     max_sum = current_sum
                     start_idx = i
                     end_idx = j
-                
-                iteration_count += 1
-                if show_progress:
-                    pbar.update(1)
+            
+            # 每个起点结束后批量刷新进度
+            if show_progress:
+                pbar.update(n - i)
         
         if show_progress:
             pbar.close()
@@ -162,49 +550,347 @@ class MaxSubarrayAlgorithms:
         temp_start = 0
         
         if show_progress:
-            pbar = tqdm(total=n, 
+            pbar = _load_tqdm()(total=n, 
                        desc="动态规划 (Dynamic Programming)", 
                        unit="iter",
                        ncols=80)
         
-        for i in range(n):
-            current_sum += arr[i]
-            
-            # 如果当前和大于最大和，更新最大和和结束位置
-            if current_sum > max_sum:
-                max_sum = current_sum
-                start_idx = temp_start
-                end_idx = i
-            
-            # 如果当前和小于0，重置当前和和临时起始位置
-            if current_sum < 0:
-                current_sum = 0
-                temp_start = i + 1
+        # 按 PROGRESS_BATCH 分批遍历，每批结束后刷新一次进度
+        for batch_start in range(0, n, PROGRESS_BATCH):
+            batch_end = min(batch_start + PROGRESS_BATCH, n)
+            for i in range(batch_start, batch_end):
+                current_sum += arr[i]
+                
+                # 如果当前和大于最大和，更新最大和和结束位置
+                if current_sum > max_sum:
+                    max_sum = current_sum
+                    start_idx = temp_start
+                    end_idx = i
+                
+                # 如果当前和小于0，重置当前和和临时起始位置
+                if current_sum < 0:
+                    current_sum = 0
+                    temp_start = i + 1
             
             if show_progress:
-                pbar.update(1)
+                pbar.update(batch_end - batch_start)
         
         if show_progress:
             pbar.close()
         
         return max_sum, start_idx, end_idx
     
-    def compare_algorithms(self, test_sizes: List[int] = None) -> Dict[str, Any]:
+    def numpy_prefix_sum(self, arr) -> Tuple[int, int, int]:
+        """
+        NumPy向量化算法 - 前缀和 + 前缀最小值 (Vectorized NumPy - Prefix Sums + Running Minimum)
+        时间复杂度: O(n) (Time Complexity: O(n))
+        空间复杂度: O(n) (Space Complexity: O(n))
+        
+        以 arr[j] 结尾的最大子数组和 = P[j+1] - min(P[0..j])，其中 P 为前缀和数组。
+        返回值与 dynamic_programming 完全一致（相同的起止下标选择规则）。
+        """
+        a = np.asarray(arr)
+        n = a.shape[0]
+        if n == 0:
+            return float('-inf'), 0, 0
+        
+        # 前缀和 P[0] = 0, P[i+1] = arr[0] + ... + arr[i]
+        prefix = np.empty(n + 1, dtype=np.result_type(a.dtype, np.int64))
+        prefix[0] = 0
+        np.cumsum(a, out=prefix[1:])
+        
+        # running_min[j] = min(P[0..j])，gains[j] 即以 j 结尾的最优子数组和
+        running_min = np.minimum.accumulate(prefix[:-1])
+        gains = prefix[1:] - running_min
+        
+        # argmax / argmin 均返回第一次出现的位置，与 Kadane 的严格比较规则一致
+        end_idx = int(np.argmax(gains))
+        start_idx = int(np.argmin(prefix[:end_idx + 1]))
+        return gains[end_idx].item(), start_idx, end_idx
+    
+    def max_subarray_batch(self, matrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量最大子数组和 (Batch Maximum Subarray Sum)
+        对二维数组的每一行分别求解，所有行在一次向量化计算中完成。
+        时间复杂度: O(m·n) (Time Complexity: O(m·n))
+        空间复杂度: O(m·n) (Space Complexity: O(m·n))
+        
+        返回 (max_sums, starts, ends) 三个长度为 m 的数组，
+        第 r 个元素等价于 numpy_prefix_sum(matrix[r])。
+        """
+        a = np.asarray(matrix)
+        if a.ndim != 2:
+            raise ValueError("max_subarray_batch 需要二维数组 (expects a 2-D array)")
+        m, n = a.shape
+        if n == 0:
+            raise ValueError("每一行至少需要一个元素 (each row needs at least one element)")
+        
+        prefix = np.zeros((m, n + 1), dtype=np.result_type(a.dtype, np.int64))
+        np.cumsum(a, axis=1, out=prefix[:, 1:])
+        
+        running_min = np.minimum.accumulate(prefix[:, :-1], axis=1)
+        gains = prefix[:, 1:] - running_min
+        
+        rows = np.arange(m)
+        ends = np.argmax(gains, axis=1)
+        max_sums = gains[rows, ends]
+        
+        # 起点 = 每行 P[0..end] 中最小值第一次出现的位置
+        cols = np.arange(n)
+        is_min = (prefix[:, :-1] == running_min[rows, ends][:, None]) & (cols <= ends[:, None])
+        starts = np.argmax(is_min, axis=1)
+        return max_sums, starts, ends
+    
+    def circular_max_subarray(self, arr) -> Tuple[int, int, int]:
+        """
+        环形最大子数组和 (Circular Maximum Subarray Sum)
+        时间复杂度: O(n) (Time Complexity: O(n))
+        空间复杂度: O(n) (Space Complexity: O(n))
+        
+        答案要么是普通的最大子数组，要么是 总和 - 最小子数组（跨越首尾）。
+        跨越首尾时返回的 start > end，表示 arr[start:] + arr[:end+1]。
+        """
+        a = np.asarray(arr)
+        n = a.shape[0]
+        if n == 0:
+            return float('-inf'), 0, 0
+        
+        best = self.numpy_prefix_sum(a)
+        # 最小子数组 = -(对 -arr 求最大子数组)
+        neg_max, min_start, min_end = self.numpy_prefix_sum(-a.astype(np.result_type(a.dtype, np.int64)))
+        # 最小子数组覆盖整个数组时（全为负数），环形情况退化为空集，不能使用
+        if min_start == 0 and min_end == n - 1:
+            return best
+        wrap_sum = a.sum().item() + neg_max
+        if wrap_sum > best[0]:
+            return wrap_sum, (min_end + 1) % n, (min_start - 1) % n
+        return best
+    
+    def k_best_subarrays(self, arr, k: int) -> List[Tuple[int, int, int]]:
+        """
+        前 k 个互不相交的最大子数组 (Top-k Disjoint Maximum Subarrays)
+        时间复杂度: O(k·n) 最坏情况，堆操作 O(k log k) (Time Complexity: O(k·n) worst case)
+        空间复杂度: O(n + k) (Space Complexity: O(n + k))
+        
+        用最大堆保存每个剩余区间内的最优子数组；每次弹出全局最优者，
+        把它所在区间切成左右两段，再把两段各自的最优子数组压回堆中。
+        返回按和从大到小排列的 [(sum, start, end), ...]。
+        """
+        a = np.asarray(arr)
+        n = a.shape[0]
+        heap = []
+        
+        def push_segment(lo, hi):
+            if lo < hi:
+                seg_sum, s, e = self.numpy_prefix_sum(a[lo:hi])
+                # 取负实现最大堆；并列时起点靠前者优先
+                heapq.heappush(heap, (-seg_sum, lo + s, lo + e, lo, hi))
+        
+        push_segment(0, n)
+        picked = []
+        while heap and len(picked) < k:
+            neg_sum, s, e, lo, hi = heapq.heappop(heap)
+            picked.append((-neg_sum, s, e))
+            push_segment(lo, s)
+            push_segment(e + 1, hi)
+        return picked
+    
+    def max_submatrix(self, matrix) -> Tuple[int, int, int, int, int]:
+        """
+        二维最大子矩阵和 (Maximum Sum Submatrix)
+        时间复杂度: O(r²·c)，其中 r = min(行, 列) (Time Complexity: O(r²·c) with r the smaller side)
+        空间复杂度: O(r·c) (Space Complexity: O(r·c))
+        
+        枚举上边界 top，对 top 以下各行做列方向累加，得到所有 (top, bottom) 行对压缩后的一维数组，
+        再用 max_subarray_batch 一次性对这些行做向量化 Kadane。
+        返回 (max_sum, top, left, bottom, right)，边界均为闭区间。
+        """
+        a = np.asarray(matrix)
+        if a.ndim != 2 or a.size == 0:
+            raise ValueError("max_submatrix 需要非空二维数组 (expects a non-empty 2-D array)")
+        # 让枚举的维度是较短的那一维
+        transposed = a.shape[0] > a.shape[1]
+        if transposed:
+            a = a.T
+        rows = a.shape[0]
+        
+        best = (float('-inf'), 0, 0, 0, 0)
+        for top in range(rows):
+            # strips[r] = a[top] + ... + a[top + r]，即行对 (top, top + r) 压缩后的列和
+            strips = np.cumsum(a[top:], axis=0, dtype=np.result_type(a.dtype, np.int64))
+            sums, starts, ends = self.max_subarray_batch(strips)
+            r = int(np.argmax(sums))
+            if sums[r] > best[0]:
+                best = (sums[r].item(), top, int(starts[r]), top + r, int(ends[r]))
+        
+        max_sum, top, left, bottom, right = best
+        if transposed:
+            return max_sum, left, top, right, bottom
+        return best
+    
+    def parallel_divide_conquer(self, arr, workers: int = 4,
+                                pool: ProcessPoolExecutor = None) -> Tuple[int, int, int]:
+        """
+        并行分治算法 (Parallel Divide and Conquer over a Process Pool)
+        时间复杂度: O(n) 串行拷贝 + O(n / p + p)；传入 SharedArray 时为 O(n / p + p)
+        (Time Complexity: O(n) serial copy + O(n / p + p); O(n / p + p) for a SharedArray, p = workers)
+        空间复杂度: O(n) 共享内存 + O(p) 摘要 (Space: O(n) shared memory + O(p) summaries)
+        
+        普通数组会先在主进程中拷贝到 multiprocessing.shared_memory (O(n)，不能并行)，调用结束后释放；
+        对同一份数据反复求解时，传入调用者持有的 SharedArray 即可省去每次的拷贝。
+        子进程按名称挂载共享内存，不经过 pickle；每个子进程把自己的区块归约为
+        (总和, 最大前缀, 最大后缀, 最大子数组) 摘要，主进程按顺序合并摘要得到全局结果及全局下标。
+        pool: 复用已有的进程池 (reuse an existing pool)，避免每次调用都承担进程启动开销；
+              为 None 时临时创建一个 workers 个进程的进程池。
+        """
+        owns_shared = not isinstance(arr, SharedArray)
+        a = np.ascontiguousarray(arr) if owns_shared else arr.array
+        n = a.shape[0]
+        if n == 0:
+            return float('-inf'), 0, 0
+        workers = max(1, min(workers, n))
+        
+        shared = SharedArray(a) if owns_shared else arr
+        try:
+            bounds = np.linspace(0, n, workers + 1, dtype=np.int64)
+            owns_pool = pool is None
+            if owns_pool:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(_chunk_summary, shared.name, a.dtype.str, n,
+                                       int(bounds[k]), int(bounds[k + 1]))
+                           for k in range(workers)]
+                summaries = [f.result() for f in futures]
+            finally:
+                if owns_pool:
+                    pool.shutdown()
+        finally:
+            if owns_shared:
+                shared.close()
+        
+        merged = summaries[0]
+        for summary in summaries[1:]:
+            merged = _merge_summaries(merged, summary)
+        return merged[3]
+    
+    def streaming_kadane(self, chunks: Iterable) -> Tuple[int, int, int]:
+        """
+        流式最大子数组和 (Streaming / Out-of-core Maximum Subarray Sum)
+        时间复杂度: O(n) (Time Complexity: O(n))
+        空间复杂度: O(chunk) (Space Complexity: O(chunk size))
+        
+        逐块读取数据，跨块携带状态：当前前缀和 P、已见前缀和的最小值及其下标、全局最优解。
+        块内使用前缀和 + 前缀最小值向量化计算，返回的起止下标为全局绝对偏移，
+        结果与对整个数组调用 dynamic_programming 一致。
+        """
+        offset = 0                  # 当前块在全局数组中的起始位置
+        base = 0                    # 当前块之前所有元素的和，即 P[offset]
+        min_prefix = None           # min(P[0..offset-1])
+        min_prefix_idx = 0          # 最小前缀和第一次出现的位置
+        max_sum = float('-inf')
+        start_idx = 0
+        end_idx = 0
+        
+        for chunk in chunks:
+            a = np.asarray(chunk)
+            m = a.shape[0]
+            if m == 0:
+                continue
+            
+            # before[j] = P[offset + j]，即块内第 j 个元素之前的前缀和
+            before = np.empty(m + 1, dtype=np.result_type(a.dtype, np.int64))
+            before[0] = base
+            np.cumsum(a, out=before[1:])
+            before[1:] += base
+            
+            running_min = np.minimum.accumulate(before[:-1])
+            if min_prefix is not None:
+                np.minimum(running_min, min_prefix, out=running_min)
+            gains = before[1:] - running_min
+            
+            j = int(np.argmax(gains))
+            if gains[j] > max_sum:
+                max_sum = gains[j].item()
+                end_idx = offset + j
+                local_min_idx = int(np.argmin(before[:j + 1]))
+                # 并列时更早的（上一块携带的）最小前缀优先
+                if min_prefix is not None and min_prefix <= before[local_min_idx]:
+                    start_idx = min_prefix_idx
+                else:
+                    start_idx = offset + local_min_idx
+            
+            # 更新跨块携带的状态
+            local_min_idx = int(np.argmin(before[:-1]))
+            if min_prefix is None or before[local_min_idx] < min_prefix:
+                min_prefix = before[local_min_idx].item()
+                min_prefix_idx = offset + local_min_idx
+            base = before[-1].item()
+            offset += m
+        
+        return max_sum, start_idx, end_idx
+    
+    def max_subarray_file(self, path: str, dtype: str = 'int64',
+                          chunk_size: int = 1 << 22) -> Tuple[int, int, int]:
+        """
+        对二进制文件求最大子数组和 (Maximum Subarray Sum of a Binary File)
+        通过 np.memmap 映射文件，每次只把 chunk_size 个元素读入内存，
+        可处理大于内存的 int64 / float64 原始数据文件。
+        """
+        data = np.memmap(path, dtype=np.dtype(dtype), mode='r')
+        try:
+            chunks = (np.array(data[lo:lo + chunk_size])
+                      for lo in range(0, data.shape[0], chunk_size))
+            return self.streaming_kadane(chunks)
+        finally:
+            del data
+    
+    def compare_algorithms(self, test_sizes: List[int] = None,
+                           parallel_workers: List[int] = None,
+                           warmup: int = 1, repeat: int = 3,
+                           sinks: List = None, k_best_count: int = 3,
+                           parallel_size: int = 1_000_000) -> Dict[str, Any]:
         """
         算法性能对比 (Algorithm Performance Comparison)
+        parallel_workers: 并行分治的进程数列表，用于测量扩展性 (worker counts for the scaling test)
+        parallel_size: 扩展性测试使用的数组长度 (array length for the scaling test)；
+                       小数组上测到的只是进程启动开销，因此单独在大数组上测量
+        warmup / repeat: 每个算法的预热次数与重复次数，记录中位数耗时 (median of repeated runs)
+        sinks: 计时记录输出目标，例如 JSONSink / CSVSink (pluggable result sinks)
+        k_best_count: 前 k 个不相交子数组中的 k (k for the k-best engine)
         """
         if test_sizes is None:
             test_sizes = [10, 50, 100, 200, 500, 1000]
+        if parallel_workers is None:
+            parallel_workers = [1, 2, 4, 8]
         
         results = {
             'sizes': test_sizes,
             'brute_force_times': [],
             'optimized_enum_times': [],
             'dynamic_prog_times': [],
-            'algorithms': ['暴力枚举\n(Brute Force)', '优化枚举\n(Optimized Enum)', '动态规划\n(Dynamic Programming)'],
-            'complexities': ['O(n³)', 'O(n²)', 'O(n)']
+            'numpy_prefix_times': [],
+            'circular_times': [],
+            'k_best_times': [],
+            'submatrix_2d_times': [],
+            'parallel_workers': parallel_workers,
+            'parallel_size': parallel_size,
+            'parallel_times': {},
+            'timing_stats': [],
+            'algorithms': ['暴力枚举\n(Brute Force)', '优化枚举\n(Optimized Enum)', '动态规划\n(Dynamic Programming)',
+                           'NumPy前缀和\n(NumPy Prefix Sum)', '环形\n(Circular)', '前k个不相交\n(k-Best Disjoint)',
+                           '二维子矩阵\n(2-D Submatrix)'],
+            'complexities': ['O(n³)', 'O(n²)', 'O(n)', 'O(n)', 'O(n)', 'O(k·n)', 'O(r²·c)']
         }
         
+        def timed(label, func, *args, **kwargs):
+            """预热 + 重复计时，返回 (结果, 中位数秒数) (warm-up + repeated timing)"""
+            result, record = measure(func, *args, name=label, warmup=warmup, repeat=repeat,
+                                     sinks=sinks, tags={'size': size}, **kwargs)
+            results['timing_stats'].append(record)
+            median_s = record['median_ns'] / 1e9
+            print(f"  {label}: {median_s:.6f}s (p95 {record['p95_ns'] / 1e9:.6f}s)")
+            return result, median_s
+        
         print("\n" + "="*60)
         print("算法性能对比测试 (Algorithm Performance Comparison Test)")
         print("="*60)
@@ -217,44 +903,140 @@ class MaxSubarrayAlgorithms:
             
             # 测试暴力枚举算法
             if size <= 500:  # 对于大数组，跳过暴力枚举以节省时间
-                start_time = time.time()
-                max_sum1, start1, end1 = self.brute_force(test_array, show_progress=False)
-                brute_force_time = time.time() - start_time
+                (max_sum1, start1, end1), brute_force_time = timed(
+                    "暴力枚举 (Brute Force)", self.brute_force, test_array, show_progress=False)
                 results['brute_force_times'].append(brute_force_time)
-                print(f"  暴力枚举 (Brute Force): {brute_force_time:.4f}s")
             else:
                 results['brute_force_times'].append(None)
                 print(f"  暴力枚举 (Brute Force): 跳过 (Skipped) - 数组过大")
             
             # 测试优化枚举算法
-            start_time = time.time()
-            max_sum2, start2, end2 = self.optimized_enumeration(test_array, show_progress=False)
-            optimized_enum_time = time.time() - start_time
+            (max_sum2, start2, end2), optimized_enum_time = timed(
+                "优化枚举 (Optimized Enum)", self.optimized_enumeration, test_array, show_progress=False)
             results['optimized_enum_times'].append(optimized_enum_time)
-            print(f"  优化枚举 (Optimized Enum): {optimized_enum_time:.4f}s")
             
             # 测试动态规划算法
-            start_time = time.time()
-            max_sum3, start3, end3 = self.dynamic_programming(test_array, show_progress=False)
-            dynamic_prog_time = time.time() - start_time
+            (max_sum3, start3, end3), dynamic_prog_time = timed(
+                "动态规划 (Dynamic Programming)", self.dynamic_programming, test_array, show_progress=False)
             results['dynamic_prog_times'].append(dynamic_prog_time)
-            print(f"  动态规划 (Dynamic Programming): {dynamic_prog_time:.4f}s")
+            
+            # 测试NumPy向量化算法
+            (max_sum4, start4, end4), numpy_prefix_time = timed(
+                "NumPy前缀和 (NumPy Prefix Sum)", self.numpy_prefix_sum, test_array)
+            results['numpy_prefix_times'].append(numpy_prefix_time)
+            
+            # 测试扩展问题：环形、前 k 个不相交、二维子矩阵（约 √n × √n 的网格）
+            (circular_sum, _, _), circular_time = timed(
+                "环形 (Circular)", self.circular_max_subarray, test_array)
+            results['circular_times'].append(circular_time)
+            
+            k_best, k_best_time = timed(
+                f"前{k_best_count}个不相交 (k-Best Disjoint, k={k_best_count})",
+                self.k_best_subarrays, test_array, k_best_count)
+            results['k_best_times'].append(k_best_time)
+            
+            side = max(1, math.isqrt(size))
+            grid = np.array(test_array[:side * side]).reshape(side, side)
+            _, submatrix_time = timed("二维子矩阵 (2-D Submatrix)", self.max_submatrix, grid)
+            results['submatrix_2d_times'].append(submatrix_time)
+            extensions_ok = circular_sum >= max_sum4 and k_best[0][0] == max_sum4
             
             # 验证结果一致性
             if size <= 500:
-                if max_sum1 == max_sum2 == max_sum3:
+                if max_sum1 == max_sum2 == max_sum3 == max_sum4 and extensions_ok:
                     print(f"  ✓ 结果验证通过 (Results Verified): 最大和 = {max_sum1}")
                 else:
                     print(f"  ✗ 结果不一致 (Results Inconsistent)!")
             else:
-                if max_sum2 == max_sum3:
+                if max_sum2 == max_sum3 == max_sum4 and extensions_ok:
                     print(f"  ✓ 结果验证通过 (Results Verified): 最大和 = {max_sum2}")
                 else:
                     print(f"  ✗ 结果不一致 (Results Inconsistent)!")
         
+        # 测试并行分治算法的扩展性：大数组，每个进程数只创建一次进程池并在预热时启动全部子进程，
+        # 计时只包含分块归约与合并，不包含进程启动 (pool reused across warm-up and repeats)。
+        # 数组预先放入 SharedArray，主进程中 O(n) 的串行拷贝单独计时，不计入各进程数的耗时
+        size = parallel_size
+        print(f"\n并行扩展性测试 (Parallel Scaling Test), 数组大小 (Array Size): {size}")
+        big_array = np.random.default_rng().integers(-100, 101, size=size, dtype=np.int64)
+        (baseline_sum, _, _), baseline_time = timed(
+            "NumPy前缀和 (NumPy Prefix Sum, 单进程基线)", self.numpy_prefix_sum, big_array)
+        results['parallel_baseline_time'] = baseline_time
+        _, copy_time = timed("拷贝到共享内存 (Copy into Shared Memory, 串行 O(n))",
+                             lambda a: SharedArray(a).close(), big_array)
+        results['parallel_copy_time'] = copy_time
+        parallel_ok = True
+        with SharedArray(big_array) as shared:
+            for workers in parallel_workers:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    (max_sum_p, _, _), parallel_time = timed(
+                        f"并行分治 (Parallel D&C, {workers} workers, 不含拷贝)", self.parallel_divide_conquer,
+                        shared, workers=workers, pool=pool)
+                results['parallel_times'][workers] = parallel_time
+                parallel_ok = parallel_ok and max_sum_p == baseline_sum
+        base = results['parallel_times'].get(parallel_workers[0]) if parallel_workers else None
+        if base:
+            speedups = ", ".join(f"{w}: {base / t:.2f}x" for w, t in results['parallel_times'].items())
+            print(f"  相对 {parallel_workers[0]} 个进程的加速比 (Speedup vs {parallel_workers[0]} worker(s)): {speedups}")
+        print("  ✓ 并行结果验证通过 (Parallel Results Verified)" if parallel_ok
+              else "  ✗ 并行结果不一致 (Parallel Results Inconsistent)!")
+        
+        for sink in sinks or []:
+            sink.close()
+        
         self.results = results
         return results
     
+    def compare_sliding_window(self, window_sizes: List[int] = None, ticks: int = 2000) -> Dict[str, Any]:
+        """
+        滑动窗口性能对比 (Sliding-Window Performance Comparison)
+        每个 tick 追加一个新值并求窗口内最大子数组和：
+        线段树 O(log W) 更新 vs 每次对整个窗口重新运行 Kadane O(W)。
+        """
+        if window_sizes is None:
+            window_sizes = [100, 1000, 10000]
+        
+        results = {'window_sizes': window_sizes, 'ticks': ticks,
+                   'segment_tree_times': [], 'rerun_kadane_times': []}
+        
+        print("\n" + "="*60)
+        print("滑动窗口对比测试 (Sliding-Window Comparison Test)")
+        print("="*60)
+        
+        for window in window_sizes:
+            print(f"\n窗口大小 (Window Size): {window}, 更新次数 (Ticks): {ticks}")
+            warmup = [random.randint(-100, 100) for _ in range(window)]
+            feed = [random.randint(-100, 100) for _ in range(ticks)]
+            
+            tree = SlidingWindowMaxSubarray(window)
+            for value in warmup:
+                tree.append(value)
+            tree_answers = []
+            with PerfTimer("segment_tree", window=window) as timer:
+                for value in feed:
+                    tree.append(value)
+                    tree_answers.append(tree.query())
+            tree_time = timer.elapsed_ns / 1e9
+            results['segment_tree_times'].append(tree_time)
+            print(f"  线段树 (Segment Tree): {tree_time:.4f}s")
+            
+            buffer = deque(warmup, maxlen=window)
+            kadane_answers = []
+            with PerfTimer("rerun_kadane", window=window) as timer:
+                for value in feed:
+                    buffer.append(value)
+                    kadane_answers.append(self.dynamic_programming(list(buffer), show_progress=False)[0])
+            kadane_time = timer.elapsed_ns / 1e9
+            results['rerun_kadane_times'].append(kadane_time)
+            print(f"  重新运行Kadane (Re-run Kadane): {kadane_time:.4f}s")
+            
+            if tree_answers == kadane_answers:
+                print(f"  ✓ 结果验证通过 (Results Verified), 加速比 (Speedup): {kadane_time / max(tree_time, 1e-9):.1f}x")
+            else:
+                print(f"  ✗ 结果不一致 (Results Inconsistent)!")
+        
+        return results
+    
     def visualize_performance(self, save_path: str = None):
         """
         可视化算法性能对比 (Visualize Algorithm Performance Comparison)
@@ -264,6 +1046,8 @@ class MaxSubarrayAlgorithms:
             print("请先运行 compare_algorithms() 方法 (Please run compare_algorithms() first)")
             return
         
+        plt = self.font_manager.plt
+        tqdm = _load_tqdm()
         sizes = self.results['sizes']
         base_path = save_path or 'e:\\2025fall\\DS'
         
@@ -362,8 +1146,275 @@ class MaxSubarrayAlgorithms:
         print(f"All charts have been saved to directory: {base_path}")
         print("=" * 60)
 
-def main():
+# ---------------------------------------------------------------------------
+# 可复现的基准测试 (Reproducible benchmark suite with regression detection)
+# ---------------------------------------------------------------------------
+
+BENCHMARK_SCHEMA_VERSION = 1
+BENCHMARK_DISTRIBUTIONS = ['random', 'all_negative', 'all_positive', 'adversarial']
+
+
+def generate_benchmark_array(size: int, distribution: str, seed: int) -> List[int]:
+    """
+    按固定种子生成测试数组 (Generate a seeded test array)
+    random: [-100, 100] 均匀分布；all_negative / all_positive: 全负 / 全正；
+    adversarial: 正负交替且每对和为 -1，使 Kadane 频繁重置、最大值频繁更新。
+    """
+    rng = random.Random(f"{seed}-{distribution}-{size}")
+    if distribution == 'random':
+        return [rng.randint(-100, 100) for _ in range(size)]
+    if distribution == 'all_negative':
+        return [rng.randint(-100, -1) for _ in range(size)]
+    if distribution == 'all_positive':
+        return [rng.randint(1, 100) for _ in range(size)]
+    if distribution == 'adversarial':
+        arr = []
+        for i in range(size):
+            if i % 2 == 0:
+                arr.append(i // 2 + rng.randint(0, 3))
+            else:
+                arr.append(-(arr[-1] + 1))
+        return arr
+    raise ValueError(f"未知的分布 (unknown distribution): {distribution}")
+
+
+def _mann_whitney_slower_p(baseline: List[int], current: List[int]) -> float:
+    """
+    单侧 Mann-Whitney U 检验（正态近似）：current 比 baseline 慢的 p 值
+    (One-sided Mann-Whitney U test, normal approximation: p-value that current is slower)
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    u = 0.0
+    for c in current:
+        for b in baseline:
+            if c > b:
+                u += 1.0
+            elif c == b:
+                u += 0.5
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sd == 0:
+        return 1.0
+    z = (u - mean) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def measure_import_time(module: str = 'DS_max_sum_optimized', repeat: int = 5) -> List[int]:
+    """
+    用 python -X importtime 测量模块的累计导入耗时 (Cumulative import time via -X importtime)
+    每次在新的子进程中导入，返回纳秒样本列表。
+    """
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              cwd=module_dir, capture_output=True, text=True, check=True)
+        for line in proc.stderr.splitlines():
+            # 格式: "import time:  self [us] | cumulative | imported package"
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                samples.append(int(parts[1].strip()) * 1000)
+                break
+    samples.sort()
+    return samples
+
+
+class BenchmarkRunner:
+    """
+    可复现的最大子数组和基准测试 (Reproducible Max-Subarray Benchmark Runner)
+    - 固定种子生成数据，规模与分布可配置
+    - 计时时关闭 GC 并为每个引擎拷贝输入，避免相互干扰
+    - 结果追加到带版本号的 JSON 历史文件和 CSV 文件
+    - compare() 对比基线，标记统计显著的性能退化
+    """
+    
+    # 每个引擎允许的最大规模，超过则跳过 (size cap per engine)
+    ENGINE_MAX_SIZE = {
+        'brute_force': 300,
+        'optimized_enumeration': 3000,
+        'dynamic_programming': None,
+        'numpy_prefix_sum': None,
+    }
+    
+    def __init__(self, sizes: List[int] = None, distributions: List[str] = None,
+                 engines: List[str] = None, seed: int = 20250901,
+                 warmup: int = 1, repeat: int = 7, include_import_time: bool = True):
+        self.include_import_time = include_import_time
+        self.sizes = sizes or [100, 1000, 10000, 100000]
+        self.distributions = distributions or list(BENCHMARK_DISTRIBUTIONS)
+        self.engines = engines or list(self.ENGINE_MAX_SIZE)
+        self.seed = seed
+        self.warmup = warmup
+        self.repeat = repeat
+        self.algorithms = MaxSubarrayAlgorithms()
+        self.records = []
+    
+    def _engine(self, name: str):
+        func = getattr(self.algorithms, name)
+        if name == 'numpy_prefix_sum':
+            return func
+        return functools.partial(func, show_progress=False)
+    
+    def run(self) -> List[Dict[str, Any]]:
+        """运行所有 (引擎, 分布, 规模) 组合 (Run every engine/distribution/size combination)"""
+        self.records = []
+        if self.include_import_time:
+            # 导入耗时也作为一项记录参与回归检测
+            samples = measure_import_time(repeat=self.repeat)
+            record = {'name': 'import_time', 'warmup': 0, 'repeat': len(samples),
+                      'median_ns': int(statistics.median(samples)),
+                      'p95_ns': samples[max(0, math.ceil(0.95 * len(samples)) - 1)],
+                      'min_ns': samples[0], 'max_ns': samples[-1],
+                      'distribution': 'import', 'size': 0, 'samples_ns': samples}
+            self.records.append(record)
+            print(f"  {'import_time':<22} {'-X importtime':<13} "
+                  f"median={record['median_ns'] / 1e6:.3f}ms p95={record['p95_ns'] / 1e6:.3f}ms")
+        for distribution in self.distributions:
+            for size in self.sizes:
+                data = generate_benchmark_array(size, distribution, self.seed)
+                for name in self.engines:
+                    max_size = self.ENGINE_MAX_SIZE.get(name)
+                    if max_size is not None and size > max_size:
+                        continue
+                    arr = list(data)
+                    gc.collect()
+                    gc_was_enabled = gc.isenabled()
+                    gc.disable()
+                    try:
+                        result, record = measure(self._engine(name), arr, name=name,
+                                                 warmup=self.warmup, repeat=self.repeat,
+                                                 keep_samples=True,
+                                                 tags={'distribution': distribution, 'size': size})
+                    finally:
+                        if gc_was_enabled:
+                            gc.enable()
+                    record['max_sum'] = result[0]
+                    self.records.append(record)
+                    print(f"  {name:<22} {distribution:<13} n={size:<8} "
+                          f"median={record['median_ns'] / 1e6:.3f}ms p95={record['p95_ns'] / 1e6:.3f}ms")
+        return self.records
+    
+    def _run_metadata(self, label: str = None) -> Dict[str, Any]:
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        return {
+            'label': label or timestamp,
+            'timestamp': timestamp,
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': self.seed,
+            'warmup': self.warmup,
+            'repeat': self.repeat,
+        }
+    
+    def save(self, json_path: str, csv_path: str = None, label: str = None) -> Dict[str, Any]:
+        """
+        把本次结果追加到历史文件 (Append this run to the JSON / CSV history)
+        JSON: {"schema_version": 1, "runs": [{...metadata, "records": [...]}, ...]}
+        """
+        run = self._run_metadata(label)
+        run['records'] = self.records
+        
+        history = {'schema_version': BENCHMARK_SCHEMA_VERSION, 'runs': []}
+        if os.path.exists(json_path):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+            if history.get('schema_version') != BENCHMARK_SCHEMA_VERSION:
+                raise ValueError(f"历史文件版本不兼容 (incompatible history schema): {json_path}")
+        history['runs'].append(run)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+        
+        if csv_path:
+            sink = CSVSink(csv_path)
+            for record in self.records:
+                row = {'label': run['label'], 'timestamp': run['timestamp'],
+                       'schema_version': BENCHMARK_SCHEMA_VERSION}
+                row.update({k: v for k, v in record.items() if k != 'samples_ns'})
+                sink.emit(row)
+            sink.close()
+        return run
+    
+    @staticmethod
+    def load_baseline(path: str) -> List[Dict[str, Any]]:
+        """读取基线：历史文件取最后一次运行，也接受单次运行或记录列表 (Load baseline records)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return data
+        if 'runs' in data:
+            if not data['runs']:
+                raise ValueError(f"基线文件中没有运行记录 (no runs in baseline): {path}")
+            return data['runs'][-1]['records']
+        return data['records']
+    
+    def compare(self, baseline_records: List[Dict[str, Any]], threshold: float = 0.05,
+                alpha: float = 0.01) -> List[Dict[str, Any]]:
+        """
+        与基线对比，返回统计显著的性能退化列表 (Return statistically significant slowdowns)
+        判定条件：中位数变慢超过 threshold，且单侧 Mann-Whitney U 检验 p < alpha。
+        """
+        baseline = {(r['name'], r['distribution'], r['size']): r for r in baseline_records}
+        regressions = []
+        for record in self.records:
+            base = baseline.get((record['name'], record['distribution'], record['size']))
+            if base is None:
+                continue
+            ratio = record['median_ns'] / max(base['median_ns'], 1)
+            p_value = _mann_whitney_slower_p(base.get('samples_ns', [base['median_ns']]),
+                                             record['samples_ns'])
+            if ratio > 1 + threshold and p_value < alpha:
+                regressions.append({'name': record['name'], 'distribution': record['distribution'],
+                                    'size': record['size'], 'baseline_median_ns': base['median_ns'],
+                                    'median_ns': record['median_ns'], 'ratio': ratio,
+                                    'p_value': p_value})
+        return regressions
+
+
+def benchmark_main(sizes: List[int] = None, distributions: List[str] = None, seed: int = 20250901,
+                   repeat: int = 7, history: str = 'benchmark_history.json',
+                   history_csv: str = 'benchmark_history.csv', baseline: str = None,
+                   label: str = None, threshold: float = 0.05) -> int:
+    """基准测试入口，发现性能退化时返回 1 (Benchmark entry point; returns 1 on regressions)"""
+    print("="*80)
+    print("可复现基准测试 (Reproducible Benchmark Suite)")
+    print("="*80)
+    # 先读取基线，避免基线与历史文件相同时与本次结果自身比较
+    baseline_records = BenchmarkRunner.load_baseline(baseline) if baseline else None
+    runner = BenchmarkRunner(sizes=sizes, distributions=distributions, seed=seed, repeat=repeat)
+    runner.run()
+    runner.save(history, history_csv, label=label)
+    print(f"\n结果已追加到 (Results appended to): {history}, {history_csv}")
+    
+    if baseline_records is None:
+        return 0
+    regressions = runner.compare(baseline_records, threshold=threshold)
+    if not regressions:
+        print(f"✓ 未发现性能退化 (No significant regressions vs {baseline})")
+        return 0
+    print(f"✗ 发现 {len(regressions)} 项性能退化 (Significant regressions vs {baseline}):")
+    for r in regressions:
+        print(f"  {r['name']:<22} {r['distribution']:<13} n={r['size']:<8} "
+              f"{r['baseline_median_ns'] / 1e6:.3f}ms -> {r['median_ns'] / 1e6:.3f}ms "
+              f"({r['ratio']:.2f}x, p={r['p_value']:.4f})")
+    return 1
+
+
+def main(file_path: str = None, dtype: str = 'int64', chunk_size: int = 1 << 22):
     """主函数 (Main Function)"""
+    if file_path is not None:
+        # 流式模式：只处理文件，不运行演示与绘图
+        print(f"流式处理文件 (Streaming file): {file_path}  dtype={dtype}  chunk={chunk_size}")
+        algorithms = MaxSubarrayAlgorithms()
+        with PerfTimer("max_subarray_file") as timer:
+            max_sum, start, end = algorithms.max_subarray_file(file_path, dtype=dtype, chunk_size=chunk_size)
+        elapsed = timer.elapsed_ns / 1e9
+        print(f"结果 (Result): 最大和 = {max_sum}, 子数组位置 = [{start}:{end+1}]")
+        print(f"耗时 (Elapsed): {elapsed:.4f}s")
+        return
+    
     print("="*80)
     print("最大子数组和问题 - 三种算法实现与性能对比")
     print("Maximum Subarray Sum Problem - Three Algorithm Implementations and Performance Comparison")
@@ -416,6 +1467,9 @@ def main():
     test_sizes = [10, 50, 100, 200, 500, 1000]
     results = algorithms.compare_algorithms(test_sizes)
     
+    # 滑动窗口对比测试
+    algorithms.compare_sliding_window()
+    
     # 生成可视化图表
     print("\n" + "-"*60)
     print("生成可视化图表 (Generating Visualization Charts)")
@@ -428,4 +1482,26 @@ def main():
     print("="*80)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default=None,
+                        help="以流式方式处理的二进制数据文件 (binary dump processed via np.memmap)")
+    parser.add_argument("--dtype", default="int64", choices=["int64", "float64", "int32", "float32"])
+    parser.add_argument("--chunk-size", type=int, default=1 << 22)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="运行可复现基准测试并追加历史记录 (run the reproducible benchmark suite)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None)
+    parser.add_argument("--distributions", nargs="+", choices=BENCHMARK_DISTRIBUTIONS, default=None)
+    parser.add_argument("--seed", type=int, default=20250901)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--history", default="benchmark_history.json")
+    parser.add_argument("--history-csv", default="benchmark_history.csv")
+    parser.add_argument("--label", default=None, help="本次运行的版本标签 (version label for this run)")
+    parser.add_argument("--compare", default=None, metavar="BASELINE_JSON",
+                        help="与基线对比并标记显著退化 (flag significant slowdowns vs a baseline)")
+    parser.add_argument("--threshold", type=float, default=0.05)
+    args = parser.parse_args()
+    if args.benchmark or args.compare:
+        sys.exit(benchmark_main(sizes=args.sizes, distributions=args.distributions, seed=args.seed,
+                                repeat=args.repeat, history=args.history, history_csv=args.history_csv,
+                                baseline=args.compare, label=args.label, threshold=args.threshold))
+    main(file_path=args.file, dtype=args.dtype, chunk_size=args.chunk_size)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+冒烟测试：把一个本地 Slidev 构建（dist）并行导出为 PDF，检查页数与期望一致、没有空白页。
+不指定 DIST_DIR 时在临时目录里生成一个小文稿并用 slidev build 构建（需要 Node.js，首次运行会从 npm 安装 @slidev/cli）。
+
+用法：
+    python slidev_smoke.py                      # 构建示例文稿（SAMPLE_SLIDES 页）并检查
+    python slidev_smoke.py path/to/dist --expect 12
+"""
+import os
+import io
+import re
+import hashlib
+import asyncio
+import tempfile
+import subprocess
+import argparse
+from PIL import Image
+from slidev_to_pdf import StreamingPDFWriter, serve_static_build, stop_static_build, capture_slides_async
+
+SAMPLE_SLIDES = 4
+
+def build_sample_deck(workdir, slides=SAMPLE_SLIDES):
+    """写一个每页内容都不同的 slides.md 并构建，返回 dist 目录"""
+    pages = [f"# Slide {n}\n\n第 {n} 页\n\n- item {n}.1\n- item {n}.2\n" for n in range(1, slides + 1)]
+    with open(os.path.join(workdir, "slides.md"), "w", encoding="utf-8") as f:
+        f.write("---\ntheme: default\n---\n\n" + "\n---\n\n".join(pages))
+    with open(os.path.join(workdir, "package.json"), "w", encoding="utf-8") as f:
+        f.write('{"private": true, "dependencies": {"@slidev/cli": "latest", "@slidev/theme-default": "latest"}}\n')
+    subprocess.run(["npm", "install", "--no-audit", "--no-fund"], cwd=workdir, check=True)
+    subprocess.run(["npx", "slidev", "build", "slides.md", "--out", "dist"], cwd=workdir, check=True)
+    return os.path.join(workdir, "dist")
+
+def is_blank(png):
+    """整张截图只有一种颜色即视为空白页"""
+    lo, hi = Image.open(io.BytesIO(png)).convert("L").getextrema()
+    return lo == hi
+
+def pdf_page_count(path):
+    with open(path, "rb") as f:
+        m = re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", f.read())
+    return int(m.group(1)) if m else 0
+
+def run_smoke(dist, expect=None, concurrency=2, distinct=False):
+    """导出 dist 并返回发现的问题列表（为空表示通过）"""
+    digests = {}
+    blank = []
+    out_path = os.path.join(tempfile.mkdtemp(prefix="slidev_smoke_"), "smoke.pdf")
+    server, url = serve_static_build(dist)
+    try:
+        with open(out_path, "wb") as f, StreamingPDFWriter(f) as writer:
+            def sink(n, data):
+                if is_blank(data):
+                    blank.append(n)
+                digests[n] = hashlib.sha256(data).hexdigest()
+                writer.add_png(data)
+            total, _ = asyncio.run(capture_slides_async(url, sink, concurrency=concurrency))
+    finally:
+        stop_static_build(server)
+
+    problems = []
+    pages = pdf_page_count(out_path)
+    if pages != total:
+        problems.append(f"PDF 有 {pages} 页，检测到的总页数为 {total}")
+    if expect is not None and total != expect:
+        problems.append(f"检测到 {total} 页，期望 {expect} 页")
+    if blank:
+        problems.append(f"空白页：{blank}")
+    if distinct:
+        seen = {}
+        for n in sorted(digests):
+            if digests[n] in seen:
+                problems.append(f"第 {n} 页与第 {seen[digests[n]]} 页的截图完全相同（该页可能没有渲染）")
+            seen.setdefault(digests[n], n)
+    print(f"{total} slides -> {out_path}")
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dist", nargs="?", default=None, help="slidev build 的输出目录；省略时构建示例文稿")
+    parser.add_argument("--expect", type=int, default=None, help="期望的页数")
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+    if args.dist is None:
+        dist = build_sample_deck(tempfile.mkdtemp(prefix="slidev_sample_"))
+        # 示例文稿每页内容都不同，截图重复说明该页没有等到渲染完成
+        problems = run_smoke(dist, expect=SAMPLE_SLIDES, concurrency=args.concurrency, distinct=True)
+    else:
+        problems = run_smoke(args.dist, expect=args.expect, concurrency=args.concurrency)
+    for p in problems:
+        print("FAIL", p)
+    if not problems:
+        print("OK")
+    raise SystemExit(1 if problems else 0)
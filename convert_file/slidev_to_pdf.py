@@ -1,60 +1,735 @@
 import os
 import re
+import json
+import hashlib
 import time
+import asyncio
+import threading
+import functools
+import struct
+import zlib
+from collections import namedtuple
+from urllib.parse import urlsplit
 import img2pdf
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import argparse
 
 URL = "https://slide-ds.zhongpu.info/week3"
 TOTAL_SLIDES_DEFAULT = 20
+VIEWPORT = {"width": 1920, "height": 1080}
+HIDE_CONTROLS_CSS = """
+            *[class*="icon-btn"] { display: none !important; }
+            *[class*="slidev-controls"] { display: none !important; }
+            .controls, .toolbar, .nav, .remote-controls { display: none !important; }
+        """
+# 渲染完成信号：字体加载完毕、图片全部加载（或失败），再等两帧让布局与过渡稳定
+RENDER_READY_JS = """
+async () => {
+    await document.fonts.ready;
+    await Promise.all(Array.from(document.images).map(img => img.complete ? null :
+        new Promise(resolve => { img.onload = img.onerror = resolve; })));
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+}
+"""
+
+# 第 n 页已挂载：Slidev 给每页的容器加上 .slidev-page-<n>，该页有子元素且处于显示状态（预加载的相邻页是隐藏的）
+SLIDE_MOUNTED_JS = """
+n => {
+    const el = document.querySelector(`.slidev-page-${n}`);
+    return !!el && el.childElementCount > 0 && el.getClientRects().length > 0;
+}
+"""
+SLIDE_MOUNT_TIMEOUT_MS = 5000
+
+# 当前幻灯片区域的 HTML，用作缓存键的一部分；找不到 Slidev 容器时退回整个 body
+SLIDE_HTML_JS = """
+() => (document.querySelector('#slide-content') || document.body).innerHTML
+"""
+# 文稿资源：脚本、样式表与预加载模块的地址。slidev build 产物的文件名含内容哈希，
+# 幻灯片、主题、CSS 或图片引用变化都会改变它们；只读取属性，不序列化页面内容
+DECK_ASSETS_JS = """
+() => [
+    ...Array.from(document.scripts, s => s.getAttribute('src') || ''),
+    ...Array.from(document.querySelectorAll('link[rel=stylesheet], link[rel=modulepreload]'), l => l.getAttribute('href')),
+].join('\\n')
+"""
+# vite 构建产物的文件名形如 index-3f9a1c2b.js / index.B1x2Yz9Q.css
+_HASHED_ASSET = re.compile(r"[-.][A-Za-z0-9_-]{8,}\.(?:m?js|css)\b")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "slidev_to_pdf")
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+MAX_CACHED_COUNTS = 256  # 最多记住多少个文稿的页数，超出后淘汰最久未使用的
+
+_SERVED_DIRS = {}  # serve_static_build 的 base_url -> 构建目录的绝对路径
 
-def detect_total_slides(page, default=TOTAL_SLIDES_DEFAULT):
+def _deck_location(url):
+    """
+    文稿的位置：serve_static_build 每次使用随机端口，本机托管的构建改用构建目录的绝对路径，
+    不同目录的文稿不会共用缓存；其他地址（包括自己启动的本机开发服务器）保留完整 URL
+    """
+    parts = urlsplit(url)
+    directory = _SERVED_DIRS.get(f"{parts.scheme}://{parts.netloc}")
+    if directory is not None:
+        return "file://" + directory + parts.path
+    return url
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+# 文稿身份：key = sha256(位置, 资源地址)；content_hashed 表示资源文件名带内容哈希，可以据此缓存页数
+DeckIdentity = namedtuple("DeckIdentity", "key content_hashed")
+
+def _deck_identity(url, assets):
+    return DeckIdentity(_digest(_deck_location(url), assets), bool(_HASHED_ASSET.search(assets)))
+
+def deck_identity(page, url):
     try:
-        locator = page.get_by_text(re.compile(r"\b\d+\s*/\s*\d+\b"))
-        texts = locator.all_text_contents()
-        for t in texts:
-            m = re.search(r"(\d+)\s*/\s*(\d+)", t)
-            if m:
-                return int(m.group(2))
+        assets = page.evaluate(DECK_ASSETS_JS)
     except Exception:
-        pass
+        assets = ""
+    return _deck_identity(url, assets)
+
+async def deck_identity_async(page, url):
     try:
-        content = page.content()
-        m = re.search(r"(\d+)\s*/\s*(\d+)", content)
+        assets = await page.evaluate(DECK_ASSETS_JS)
+    except Exception:
+        assets = ""
+    return _deck_identity(url, assets)
+
+class SlideCache:
+    """
+    内容寻址的截图缓存：键为 sha256(文稿身份, 页码, 视口, 幻灯片 HTML)，值为 PNG 文件。
+    文稿身份包含位置（URL 或本机构建目录）与资源地址，CSS / 脚本 / 主题变化后截图不会被误用。
+    幻灯片内容不变时直接复用截图；总大小超过 max_bytes 时按最近使用时间（LRU）淘汰。
+    资源文件名带内容哈希时还按文稿身份记住总页数，避免每次都重新扫描页面；文稿重新构建后身份随之变化，页数会重新检测。
+    索引保存在 cache_dir/index.json。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        self._entries = index.get("entries", {})  # key -> {"size": 字节数, "used": 最近使用时间}
+        # 页数键 -> {"total": 总页数, "used": 最近使用时间}；忽略旧格式（url -> 整数）的条目
+        self._counts = {k: v for k, v in index.get("counts", {}).items() if isinstance(v, dict)}
+
+    @staticmethod
+    def key(deck, n, slide_html):
+        return _digest(deck.key, str(n), f"{VIEWPORT['width']}x{VIEWPORT['height']}", slide_html)
+
+    @staticmethod
+    def count_key(deck):
+        return _digest("count", deck.key)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                del self._entries[key]
+            else:
+                entry["used"] = time.time()
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        with open(self._path(key), "wb") as f:
+            f.write(data)
+        self._entries[key] = {"size": len(data), "used": time.time()}
+        self._evict()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._entries.values())
+        for key in sorted(self._entries, key=lambda k: self._entries[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._entries.pop(key)["size"]
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get_count(self, key):
+        entry = self._counts.get(key)
+        if entry is None:
+            return None
+        entry["used"] = time.time()
+        return entry["total"]
+
+    def set_count(self, key, total):
+        self._counts[key] = {"total": total, "used": time.time()}
+        if len(self._counts) > MAX_CACHED_COUNTS:
+            for old in sorted(self._counts, key=lambda k: self._counts[k]["used"])[:len(self._counts) - MAX_CACHED_COUNTS]:
+                del self._counts[old]
+
+    def save(self):
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"entries": self._entries, "counts": self._counts}, f)
+        os.replace(tmp, self._index_path)
+
+def _parse_total(texts):
+    for t in texts:
+        m = re.search(r"(\d+)\s*/\s*(\d+)", t)
         if m:
             return int(m.group(2))
+    return None
+
+def detect_total_slides(page, default=TOTAL_SLIDES_DEFAULT, cache=None, deck=None):
+    if cache is not None:
+        if deck is None:
+            deck = deck_identity(page, page.url)
+        if deck.content_hashed:
+            key = SlideCache.count_key(deck)
+            total = cache.get_count(key)
+            if total:
+                return total
+            total = detect_total_slides(page, default=None)
+            if total:
+                cache.set_count(key, total)
+            return total or default
+    try:
+        locator = page.get_by_text(re.compile(r"\b\d+\s*/\s*\d+\b"))
+        total = _parse_total(locator.all_text_contents())
+        if total:
+            return total
+    except Exception:
+        pass
+    try:
+        total = _parse_total([page.content()])
+        if total:
+            return total
     except Exception:
         pass
     return default
 
-def main(url=URL, out_path="Slidev_Presentation_week3.pdf", temp_dir="temp"):
-    os.makedirs(temp_dir, exist_ok=True)
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        page.set_viewport_size({"width": 1920, "height": 1080})
-        page.goto(url, wait_until="networkidle")
-        page.add_style_tag(content="""
-            *[class*="icon-btn"] { display: none !important; }
-            *[class*="slidev-controls"] { display: none !important; }
-            .controls, .toolbar, .nav, .remote-controls { display: none !important; }
-        """)
-        total = detect_total_slides(page, default=TOTAL_SLIDES_DEFAULT)
-        for i in range(1, total + 1):
-            page.screenshot(path=f"{temp_dir}/slide_{i}.png")
-            if i < total:
-                page.keyboard.press("ArrowRight")
-                time.sleep(1)
-        with open(out_path, "wb") as f:
-            f.write(img2pdf.convert([f"{temp_dir}/slide_{i}.png" for i in range(1, total + 1)]))
-        browser.close()
+async def detect_total_slides_async(page, default=TOTAL_SLIDES_DEFAULT, cache=None, deck=None):
+    if cache is not None:
+        if deck is None:
+            deck = await deck_identity_async(page, page.url)
+        if deck.content_hashed:
+            key = SlideCache.count_key(deck)
+            total = cache.get_count(key)
+            if total:
+                return total
+            total = await detect_total_slides_async(page, default=None)
+            if total:
+                cache.set_count(key, total)
+            return total or default
+    try:
+        locator = page.get_by_text(re.compile(r"\b\d+\s*/\s*\d+\b"))
+        total = _parse_total(await locator.all_text_contents())
+        if total:
+            return total
+    except Exception:
+        pass
+    try:
+        total = _parse_total([await page.content()])
+        if total:
+            return total
+    except Exception:
+        pass
+    return default
+
+def slide_url(url, n):
+    """Slidev 的每一页都有独立路由 /<n>"""
+    return f"{url.rstrip('/')}/{n}"
+
+async def _open_slide(page, url, n):
+    """
+    跳转到第 n 页并等待它真正渲染：load 事件只说明入口脚本加载完毕，路由组件可能还没挂载，
+    所以先等 .slidev-page-<n> 出现并有内容；页面结构不是 Slidev 时退回到等待网络空闲
+    """
+    await page.goto(slide_url(url, n), wait_until="load")
+    try:
+        await page.wait_for_function(SLIDE_MOUNTED_JS, arg=n, timeout=SLIDE_MOUNT_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        await page.wait_for_load_state("networkidle")
+    await page.add_style_tag(content=HIDE_CONTROLS_CSS)
+    await page.evaluate(RENDER_READY_JS)
+
+class StreamingPDFWriter:
+    """
+    逐页写出的最小 PDF 写入器：每张截图到来时立即写入文件，内存中只保留页对象的偏移量。
+    8 位、非隔行的灰度 / RGB PNG 直接复用 IDAT 压缩数据（与 img2pdf 相同，不重新编码）；
+    其他 PNG（例如带 alpha 通道）用 Pillow 转成 RGB 后再压缩。页面尺寸按 96 DPI 计算，与 img2pdf 默认一致。
+    """
+
+    def __init__(self, fileobj, dpi=96):
+        self._f = fileobj
+        self._scale = 72.0 / dpi
+        self._offsets = {}
+        self._pages = []
+        self._next_id = 3  # 1 = Pages, 2 = Catalog，最后写出
+        self.bytes_written = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self._f.write(data)
+        self.bytes_written += len(data)
+
+    def _obj(self, obj_id, body, stream=None):
+        self._offsets[obj_id] = self.bytes_written
+        self._write(f"{obj_id} 0 obj\n".encode())
+        if stream is None:
+            self._write(body + b"\nendobj\n")
+        else:
+            self._write(body + b"\nstream\n")
+            self._write(stream)
+            self._write(b"\nendstream\nendobj\n")
+
+    def _alloc(self):
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def add_png(self, data):
+        width, height, colorspace, decode_parms, stream = _png_to_pdf_image(data)
+        image_id, content_id, page_id = self._alloc(), self._alloc(), self._alloc()
+        self._obj(image_id, (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                             f"/ColorSpace /{colorspace} /BitsPerComponent 8 /Filter /FlateDecode "
+                             f"{decode_parms}/Length {len(stream)} >>").encode(), stream)
+        w, h = width * self._scale, height * self._scale
+        content = f"q\n{w:.4f} 0 0 {h:.4f} 0 0 cm\n/Im0 Do\nQ".encode()
+        self._obj(content_id, f"<< /Length {len(content)} >>".encode(), content)
+        self._obj(page_id, (f"<< /Type /Page /Parent 1 0 R /MediaBox [0 0 {w:.4f} {h:.4f}] "
+                            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+                            f"/Contents {content_id} 0 R >>").encode())
+        self._pages.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{p} 0 R" for p in self._pages)
+        self._obj(1, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode())
+        self._obj(2, b"<< /Type /Catalog /Pages 1 0 R >>")
+        xref_offset = self.bytes_written
+        size = self._next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        lines += [f"{self._offsets[i]:010d} 00000 n \n" for i in range(1, size)]
+        lines.append(f"trailer\n<< /Size {size} /Root 2 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(lines).encode())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+def _png_to_pdf_image(data):
+    """返回 (width, height, colorspace, DecodeParms 字符串, FlateDecode 数据)"""
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("截图不是 PNG 数据")
+    pos = 8
+    idat = []
+    width = height = bit_depth = color_type = interlace = None
+    while pos < len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        if ctype == b"IHDR":
+            width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+        elif ctype == b"IDAT":
+            idat.append(chunk)
+        elif ctype == b"IEND":
+            break
+        pos += 12 + length
+    if bit_depth == 8 and interlace == 0 and color_type in (0, 2):
+        colors = 1 if color_type == 0 else 3
+        colorspace = "DeviceGray" if color_type == 0 else "DeviceRGB"
+        parms = f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent 8 /Columns {width} >> "
+        return width, height, colorspace, parms, b"".join(idat)
+    # 其他格式（alpha、调色板、16 位等）交给 Pillow 解码；Pillow 是 img2pdf 的依赖
+    import io
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as im:
+        rgb = im.convert("RGB")
+        return rgb.width, rgb.height, "DeviceRGB", "", zlib.compress(rgb.tobytes(), 6)
+
+class _OrderedDelivery:
+    """
+    按页码顺序把截图交给 sink：乱序到达的截图暂存，
+    并限制最多只能领先 window 页，从而让暂存的截图数量有上界。
+    """
+
+    def __init__(self, sink, window):
+        self._sink = sink
+        self._window = window
+        self._next = 1
+        self._pending = {}
+        self._cond = asyncio.Condition()
+        self.max_buffered = 0
+
+    async def wait_turn(self, n):
+        async with self._cond:
+            await self._cond.wait_for(lambda: n < self._next + self._window)
+
+    async def deliver(self, n, data):
+        async with self._cond:
+            self._pending[n] = data
+            self.max_buffered = max(self.max_buffered, len(self._pending))
+            while self._next in self._pending:
+                self._sink(self._next, self._pending.pop(self._next))
+                self._next += 1
+            self._cond.notify_all()
+
+async def _screenshot_cached_async(page, deck, n, cache):
+    if cache is None:
+        return await page.screenshot()
+    key = SlideCache.key(deck, n, await page.evaluate(SLIDE_HTML_JS))
+    data = cache.get(key)
+    if data is None:
+        data = await page.screenshot()
+        cache.put(key, data)
+    return data
+
+def _screenshot_cached(page, deck, n, cache):
+    if cache is None:
+        return page.screenshot()
+    key = SlideCache.key(deck, n, page.evaluate(SLIDE_HTML_JS))
+    data = cache.get(key)
+    if data is None:
+        data = page.screenshot()
+        cache.put(key, data)
+    return data
+
+async def capture_with_browser(browser, url, sink, concurrency=4, total=None, cache=None):
+    """
+    在已经启动的 browser 上并行截图：打开 concurrency 个独立的 context/page，按页码顺序从队列领取任务，
+    每页直接跳转到 /<n> 路由，用渲染完成信号代替固定的 sleep。
+    截图以 bytes 形式按页码顺序交给 sink(n, png_bytes)；返回 (总页数, 最多暂存的截图数)。
+    传入 cache 时，幻灯片 HTML 未变化的页直接复用缓存的截图。
+    """
+    deck = None
+    if total is None or cache is not None:
+        context = await browser.new_context(viewport=VIEWPORT)
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="networkidle")
+            if cache is not None:
+                deck = await deck_identity_async(page, url)
+            if total is None:
+                total = await detect_total_slides_async(page, default=TOTAL_SLIDES_DEFAULT, cache=cache, deck=deck)
+        finally:
+            await context.close()
+
+    queue = asyncio.Queue()
+    for n in range(1, total + 1):
+        queue.put_nowait(n)
+    delivery = _OrderedDelivery(sink, window=2 * concurrency)
+
+    async def worker():
+        context = await browser.new_context(viewport=VIEWPORT)
+        page = await context.new_page()
+        try:
+            while not queue.empty():
+                n = queue.get_nowait()
+                await delivery.wait_turn(n)
+                await _open_slide(page, url, n)
+                await delivery.deliver(n, await _screenshot_cached_async(page, deck, n, cache))
+        finally:
+            await context.close()
+
+    # 任一页失败时取消同一文稿的其余 worker，避免它们在后台继续占用浏览器
+    tasks = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, total))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return total, delivery.max_buffered
+
+async def capture_slides_async(url, sink, concurrency=4, total=None, cache=None):
+    """启动一个独立的 Chromium，用 capture_with_browser 截取单个文稿"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return await capture_with_browser(browser, url, sink, concurrency=concurrency, total=total, cache=cache)
+        finally:
+            await browser.close()
+
+class _SPAHandler(SimpleHTTPRequestHandler):
+    """静态 Slidev 构建的请求处理：找不到的路径（如 /3）回退到 index.html"""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.exists(path):
+            self.path = "/index.html"
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_static_build(directory, port=0):
+    """在后台线程中托管本地 Slidev 构建目录（slidev build 的 dist），返回 (server, base_url)"""
+    handler = functools.partial(_SPAHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    _SERVED_DIRS[base_url] = os.path.abspath(directory)
+    return server, base_url
+
+def stop_static_build(server):
+    """停止 serve_static_build 启动的服务器并关闭监听套接字"""
+    server.shutdown()
+    server.server_close()
+    _SERVED_DIRS.pop(f"http://127.0.0.1:{server.server_address[1]}", None)
+
+def _out_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def _check_unique_outputs(jobs):
+    """多个任务写同一个输出文件会互相覆盖（并发时还会同时写同一个 .part），直接报错"""
+    seen = {}
+    for source, out in jobs:
+        key = _out_key(out)
+        if key in seen:
+            raise ValueError(f"输出路径冲突：{seen[key]} 和 {source} 都会写入 {out}")
+        seen[key] = source
+
+def load_batch_jobs(path, out_dir="."):
+    """
+    读取批量任务，返回 [(source, out_path), ...]；source 是 URL 或本地构建目录。
+    path 为目录时，其中每个含 index.html 的子目录（或目录本身）都是一个构建，输出为 out_dir/<子目录名>.pdf；
+    否则按清单文件读取：每行 "source [out_path]"，# 开头为注释，省略 out_path 时按 source 的末段命名。
+    自动命名重名时（如 https://a/week3 与 https://b/week3）依次尝试 <主机名>_<名字>.pdf、<名字>-2.pdf ……；
+    清单中显式写出的输出路径重复时抛出 ValueError。
+    """
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, "index.html")):
+            builds = [path]
+        else:
+            builds = sorted(os.path.join(path, d) for d in os.listdir(path)
+                            if os.path.exists(os.path.join(path, d, "index.html")))
+        return [(b, os.path.join(out_dir, os.path.basename(os.path.normpath(b)) + ".pdf")) for b in builds]
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            entries.append((fields[0], fields[1] if len(fields) > 1 else None))
+    explicit = [(source, out) for source, out in entries if out is not None]
+    _check_unique_outputs(explicit)
+    taken = {_out_key(out) for _, out in explicit}
+    jobs = []
+    for source, out in entries:
+        if out is None:
+            parts = urlsplit(source)
+            name = os.path.basename(parts.path.rstrip("/")) or "deck"
+            candidates = [name]
+            if parts.hostname:
+                candidates.append(f"{parts.hostname}_{name}")
+            k = 2
+            while True:
+                for candidate in candidates:
+                    out = os.path.join(out_dir, candidate + ".pdf")
+                    if _out_key(out) not in taken:
+                        break
+                else:
+                    candidates = [f"{name}-{k}"]
+                    k += 1
+                    continue
+                break
+            taken.add(_out_key(out))
+        jobs.append((source, out))
+    return jobs
+
+async def convert_batch(jobs, deck_workers=2, concurrency=2, cache=None):
+    """
+    批量导出：整个批次只启动一次 Chromium，最多 deck_workers 个文稿同时转换，
+    每个文稿内部再用 concurrency 个页面并行截图，PDF 逐页流式写出。
+    单个文稿失败不影响其他文稿：先写 <out>.part，成功后再改名。输出路径重复时抛出 ValueError。
+    返回每个文稿的结果 {"source", "out", "slides", "seconds", "error"}，顺序与 jobs 一致。
+    """
+    _check_unique_outputs(jobs)
+    results = [None] * len(jobs)
+    queue = asyncio.Queue()
+    for item in enumerate(jobs):
+        queue.put_nowait(item)
+
+    async def convert_one(browser, source, out_path):
+        server = None
+        url = source
+        if os.path.isdir(source):
+            server, url = serve_static_build(source)
+        part = out_path + ".part"
+        try:
+            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+            with open(part, "wb") as f:
+                writer = StreamingPDFWriter(f)
+                total, _ = await capture_with_browser(browser, url, lambda n, data: writer.add_png(data),
+                                                      concurrency=concurrency, cache=cache)
+                writer.close()
+            os.replace(part, out_path)
+            return total
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        finally:
+            if server is not None:
+                stop_static_build(server)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def deck_worker():
+            while not queue.empty():
+                idx, (source, out_path) = queue.get_nowait()
+                start = time.perf_counter()
+                result = {"source": source, "out": out_path, "slides": 0, "error": None}
+                try:
+                    result["slides"] = await convert_one(browser, source, out_path)
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                result["seconds"] = time.perf_counter() - start
+                results[idx] = result
+
+        try:
+            await asyncio.gather(*(deck_worker() for _ in range(max(1, min(deck_workers, len(jobs))))))
+        finally:
+            await browser.close()
+    return results
+
+def main(url=URL, out_path="Slidev_Presentation_week3.pdf", temp_dir="temp", concurrency=1, in_memory=False,
+         cache=None):
+    """
+    导出整个演示文稿为 PDF，返回统计信息：
+    页数、耗时、临时 PNG 写入磁盘的字节数（内存模式为 0）、最多同时暂存的截图数、缓存命中 / 未命中数。
+    in_memory=True 时截图保持为 bytes，逐页写入 <out_path>.part，不产生临时 PNG；
+    全部成功后才改名为 out_path，失败时删除 .part，原有的 PDF 保持不变。
+    cache 为 SlideCache 时只重新截取内容发生变化的幻灯片。
+    """
+    start = time.perf_counter()
+    stats = {"temp_bytes_written": 0, "max_buffered": 1}
+    if in_memory:
+        part = out_path + ".part"
+        pdf = open(part, "wb")
+        writer = StreamingPDFWriter(pdf)
+        sink = lambda n, data: writer.add_png(data)
+    else:
+        os.makedirs(temp_dir, exist_ok=True)
+
+        def sink(n, data):
+            with open(f"{temp_dir}/slide_{n}.png", "wb") as f:
+                f.write(data)
+            stats["temp_bytes_written"] += len(data)
+
+    ok = False
+    try:
+        if concurrency > 1:
+            total, stats["max_buffered"] = asyncio.run(
+                capture_slides_async(url, sink, concurrency=concurrency, cache=cache))
+        else:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                context = browser.new_context()
+                page = context.new_page()
+                page.set_viewport_size(VIEWPORT)
+                page.goto(url, wait_until="networkidle")
+                page.add_style_tag(content=HIDE_CONTROLS_CSS)
+                deck = deck_identity(page, url) if cache is not None else None
+                total = detect_total_slides(page, default=TOTAL_SLIDES_DEFAULT, cache=cache, deck=deck)
+                for i in range(1, total + 1):
+                    sink(i, _screenshot_cached(page, deck, i, cache))
+                    if i < total:
+                        page.keyboard.press("ArrowRight")
+                        time.sleep(1)
+                browser.close()
+        if in_memory:
+            writer.close()
+        else:
+            with open(out_path, "wb") as f:
+                f.write(img2pdf.convert([f"{temp_dir}/slide_{i}.png" for i in range(1, total + 1)]))
+        ok = True
+    finally:
+        if in_memory:
+            pdf.close()
+            if ok:
+                os.replace(part, out_path)
+            else:
+                os.remove(part)
+        if cache is not None:
+            cache.save()
+
+    stats["slides"] = total
+    if cache is not None:
+        stats["cache_hits"], stats["cache_misses"] = cache.hits, cache.misses
+    stats["seconds"] = time.perf_counter() - start
+    return stats
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("url", nargs="?", default=URL)
     parser.add_argument("--out", default="Slidev_Presentation_week3.pdf")
     parser.add_argument("--tempdir", default="temp")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="并行截图的页面数；大于 1 时按 /<n> 路由直接跳转并行截图")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="截图保持在内存中并逐页写入 PDF，不写临时 PNG 文件")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="截图缓存目录，幻灯片内容未变化时复用上次的截图")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024), metavar="MB",
+                        help="缓存大小上限（MB），超出后按 LRU 淘汰")
+    parser.add_argument("--no-cache", action="store_true", help="禁用截图缓存与页数缓存")
+    parser.add_argument("--batch", default=None, metavar="MANIFEST_OR_DIR",
+                        help="批量模式：清单文件（每行 \"url/目录 [输出路径]\"）或包含多个构建目录的目录")
+    parser.add_argument("--out-dir", default=".", help="批量模式下未指定输出路径时 PDF 的存放目录")
+    parser.add_argument("--deck-workers", type=int, default=2, help="批量模式下同时转换的文稿数")
+    parser.add_argument("--serve", default=None, metavar="DIST_DIR",
+                        help="在本地托管静态 Slidev 构建目录并对其导出（忽略 url 参数）")
     args = parser.parse_args()
-    main(url=args.url, out_path=args.out, temp_dir=args.tempdir)
-
+    cache = None if args.no_cache else SlideCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+    if args.batch:
+        start = time.perf_counter()
+        try:
+            results = asyncio.run(convert_batch(load_batch_jobs(args.batch, args.out_dir),
+                                                deck_workers=args.deck_workers,
+                                                concurrency=max(1, args.concurrency), cache=cache))
+        finally:
+            if cache is not None:
+                cache.save()
+        for r in results:
+            status = "FAILED " + r["error"] if r["error"] else f"{r['slides']} slides -> {r['out']}"
+            print(f"{r['seconds']:8.2f}s  {r['source']}: {status}")
+        failed = sum(1 for r in results if r["error"])
+        print(f"{len(results) - failed}/{len(results)} decks converted in {time.perf_counter() - start:.2f}s")
+        raise SystemExit(1 if failed else 0)
+    url = args.url
+    server = None
+    if args.serve:
+        server, url = serve_static_build(args.serve)
+    try:
+        stats = main(url=url, out_path=args.out, temp_dir=args.tempdir, concurrency=args.concurrency,
+                     in_memory=args.in_memory, cache=cache)
+        print(f"{stats['slides']} slides in {stats['seconds']:.2f}s, "
+              f"temp PNG bytes written: {stats['temp_bytes_written']:,}, "
+              f"max screenshots buffered: {stats['max_buffered']}")
+        if cache is not None:
+            print(f"cache hits: {stats['cache_hits']}, misses: {stats['cache_misses']}")
+    finally:
+        if server is not None:
+            stop_static_build(server)
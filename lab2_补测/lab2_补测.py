@@ -1,116 +1,1004 @@
-import random
-import sys
-import heapq
-import timeit
-
-# 增加递归深度限制，防止深度过大的 BST 导致报错
-sys.setrecursionlimit(200000)
-
-# Class Definitions (Fixed from PDF) 
-
-class Node:
-    def __init__(self, key, left=None, right=None):
-        self.key = key
-        self.left = left
-        self.right = right
-
-class BST:
-    def __init__(self):
-        self._root = None
-
-    def get(self, key):
-        return self._get(self._root, key)
-
-    def _get(self, x, key):
-        if x is None:
-            return None
-        if key == x.key:
-            return x.key
-        elif key < x.key:
-            return self._get(x.left, key)
-        else:
-            return self._get(x.right, key)
-
-    # 插入元素
-    def put(self, key):
-        self._root = self._put(self._root, key)
-
-    def _put(self, x, key):
-        if x is None:
-            return Node(key)
-        if key < x.key:
-            x.left = self._put(x.left, key)
-        elif key > x.key:
-            x.right = self._put(x.right, key)
-        return x
-
-    # 计算树的高度
-    def height(self):
-        return self._height(self._root)
-    
-    def _height(self, x):
-        if x is None:
-            return 0
-        return 1 + max(self._height(x.left), self._height(x.right))
-
-class MaxPQ:
-    def __init__(self):
-        self._pq = []  
-
-    def insert(self, key):
-        # 存储 -key 来模拟最大堆
-        heapq.heappush(self._pq, -key)
-
-    def contains(self, key):
-        return -key in self._pq
-    
-    # 获取最大值 (堆顶)
-    def get_max(self):
-        if not self._pq: return None
-        return -self._pq[0] 
-
-#  Experiment Setup 
-
-my_id = 42453034  
-N = 100000         
-print(f"Building data structures with N={N} random integers...")
-
-lst = [i for i in range(N)]
-random.shuffle(lst)
-
-bst = BST()
-pq = MaxPQ()
-
-# 1. 插入数据 
-for item in lst:
-    bst.put(item)
-    pq.insert(item)
-
-# 2. 插入目标最大值 (my_id)
-# my_id 远大于 range(100000)，所以它一定是最大值
-bst.put(my_id)
-pq.insert(my_id)
-
-print("Data structures built. Starting performance test...")
-
-# 3. 定义测试操作
-def get_max_from_bst():
-
-    bst.get(my_id)
-
-def get_max_from_pq():
-    # 在 MaxPQ 中，最大值就在数组索引 0 的位置
-    pq.get_max()
-
-# 4. 执行测试 
-t_bst = timeit.timeit(get_max_from_bst, number=1000)
-t_pq = timeit.timeit(get_max_from_pq, number=1000)
-
-print(f"BST get_max time (1000 runs): {t_bst:.6f} seconds")
-print(f"PQ  get_max time (1000 runs): {t_pq:.6f} seconds")
-
-if t_pq > 0:
-    print(f"Conclusion: MaxPQ is {t_bst / t_pq:.2f} times faster than BST.")
-
-# 回答 height
-print(f"The height of the BST is: {bst.height()}")
\ No newline at end of file
+import random
+import sys
+import time
+import heapq
+import timeit
+import tracemalloc
+import threading
+import asyncio
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# 增加递归深度限制，防止深度过大的 BST 导致报错
+sys.setrecursionlimit(200000)
+
+# Class Definitions (Fixed from PDF) 
+
+class Node:
+    # __slots__ 去掉每个节点的 __dict__，节省内存
+    # size / height 为子树的结点数与高度，随插入增量维护
+    __slots__ = ('key', 'left', 'right', 'size', 'height')
+
+    def __init__(self, key, left=None, right=None):
+        self.key = key
+        self.left = left
+        self.right = right
+        self.size = 1 + _size(left) + _size(right)
+        self.height = 1 + max(_h(left), _h(right))
+
+def _size(x):
+    return x.size if x is not None else 0
+
+def _h(x):
+    return x.height if x is not None else 0
+
+class OrderedTreeMixin:
+    """
+    基于子树大小 (size) 的顺序统计与范围查询，BST 与 AVLTree 共用。
+    要求结点具有 key / left / right / size 属性；平衡树上均为 O(log n + 输出规模)。
+    """
+
+    def size(self):
+        return _size(self._root)
+
+    # 小于 key 的键的个数
+    def rank(self, key):
+        r = 0
+        x = self._root
+        while x is not None:
+            if key < x.key:
+                x = x.left
+            elif key > x.key:
+                r += 1 + _size(x.left)
+                x = x.right
+            else:
+                return r + _size(x.left)
+        return r
+
+    # 第 i 小的键（从 0 开始）
+    def select(self, i):
+        if i < 0 or i >= self.size():
+            raise IndexError("select 越界")
+        x = self._root
+        while True:
+            left = _size(x.left)
+            if i < left:
+                x = x.left
+            elif i > left:
+                i -= left + 1
+                x = x.right
+            else:
+                return x.key
+
+    # 不大于 key 的最大键，不存在时返回 None
+    def floor(self, key):
+        best = None
+        x = self._root
+        while x is not None:
+            if key == x.key:
+                return x.key
+            if key < x.key:
+                x = x.left
+            else:
+                best = x.key
+                x = x.right
+        return best
+
+    # 不小于 key 的最小键，不存在时返回 None
+    def ceiling(self, key):
+        best = None
+        x = self._root
+        while x is not None:
+            if key == x.key:
+                return x.key
+            if key > x.key:
+                x = x.right
+            else:
+                best = x.key
+                x = x.left
+        return best
+
+    # 闭区间 [lo, hi] 内键的个数
+    def range_count(self, lo, hi):
+        if hi < lo:
+            return 0
+        count = self.rank(hi) - self.rank(lo)
+        if self.get(hi) is not None:
+            count += 1
+        return count
+
+    # 闭区间 [lo, hi] 内的键（升序），只访问区间相关的结点
+    def keys(self, lo, hi):
+        result = []
+        stack = []
+        x = self._root
+        while stack or x is not None:
+            if x is not None:
+                stack.append(x)
+                # 当前键不大于 lo 时，左子树全部小于 lo，不必进入
+                x = x.left if lo < x.key else None
+            else:
+                x = stack.pop()
+                if x.key > hi:
+                    break
+                if x.key >= lo:
+                    result.append(x.key)
+                x = x.right
+        return result
+
+def _sorted_unique(iterable):
+    # 校验输入为升序，并去掉重复的键（与 put 的语义一致）
+    keys = []
+    for key in iterable:
+        if keys:
+            if key < keys[-1]:
+                raise ValueError("from_sorted 需要升序输入")
+            if key == keys[-1]:
+                continue
+        keys.append(key)
+    return keys
+
+class BST(OrderedTreeMixin):
+    def __init__(self):
+        self._root = None
+
+    # 批量建树：由有序序列直接构造完全平衡的树，O(n)
+    @classmethod
+    def from_sorted(cls, iterable):
+        keys = _sorted_unique(iterable)
+
+        def build(lo, hi):
+            # 递归深度只有 O(log n)
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return Node(keys[mid], build(lo, mid), build(mid + 1, hi))
+
+        tree = cls()
+        tree._root = build(0, len(keys))
+        return tree
+
+    def get(self, key):
+        return self._get(self._root, key)
+
+    def _get(self, x, key):
+        if x is None:
+            return None
+        if key == x.key:
+            return x.key
+        elif key < x.key:
+            return self._get(x.left, key)
+        else:
+            return self._get(x.right, key)
+
+    # 插入元素
+    def put(self, key):
+        self._root = self._put(self._root, key)
+
+    def _put(self, x, key):
+        if x is None:
+            return Node(key)
+        if key < x.key:
+            x.left = self._put(x.left, key)
+        elif key > x.key:
+            x.right = self._put(x.right, key)
+        else:
+            return x
+        # 回溯时更新子树大小与高度
+        x.size = 1 + _size(x.left) + _size(x.right)
+        hl, hr = _h(x.left), _h(x.right)
+        x.height = 1 + (hl if hl > hr else hr)
+        return x
+
+    # 树的高度：根结点上增量维护的值，O(1)
+    def height(self):
+        return _h(self._root)
+
+class EytzingerBST:
+    """
+    数组存储的只读二叉搜索树 (Eytzinger 布局)。
+    节点 i 的左右孩子分别是 2i 和 2i+1，没有节点对象和指针；
+    整数键存放在 array('q') 中，其他类型退化为 list。适合读多写少的场景。
+    """
+
+    def __init__(self):
+        self._keys = array('q', [0])
+        self._n = 0
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        keys = _sorted_unique(iterable)
+        n = len(keys)
+        tree = cls()
+        if all(type(k) is int and -(1 << 63) <= k < (1 << 63) for k in keys):
+            tree._keys = array('q', bytes(8 * (n + 1)))
+        else:
+            tree._keys = [None] * (n + 1)
+        tree._n = n
+
+        # 按中序遍历顺序把有序键依次填入隐式完全二叉树
+        out = tree._keys
+        it = iter(keys)
+        stack = []
+        i = 1
+        while stack or i <= n:
+            while i <= n:
+                stack.append(i)
+                i = 2 * i
+            i = stack.pop()
+            out[i] = next(it)
+            i = 2 * i + 1
+        return tree
+
+    def __len__(self):
+        return self._n
+
+    def get(self, key):
+        keys = self._keys
+        n = self._n
+        i = 1
+        while i <= n:
+            k = keys[i]
+            if key == k:
+                return k
+            i = (i << 1) | (k < key)
+        return None
+
+    def height(self):
+        return self._n.bit_length()
+
+class AVLNode:
+    # __slots__ 去掉每个节点的 __dict__，节省内存
+    __slots__ = ('key', 'left', 'right', 'height', 'size')
+
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+def _fix_height(x):
+    # 由左右孩子重新计算高度与子树大小
+    left, right = x.left, x.right
+    hl = left.height if left is not None else 0
+    hr = right.height if right is not None else 0
+    x.height = (hl if hl > hr else hr) + 1
+    x.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+def _rotate_right(x):
+    y = x.left
+    x.left = y.right
+    y.right = x
+    _fix_height(x)
+    _fix_height(y)
+    return y
+
+def _rotate_left(x):
+    y = x.right
+    x.right = y.left
+    y.left = x
+    _fix_height(x)
+    _fix_height(y)
+    return y
+
+def _rebalance(x):
+    # 更新高度，左右子树高度差超过 1 时旋转，返回新的子树根
+    _fix_height(x)
+    balance = _h(x.left) - _h(x.right)
+    if balance > 1:
+        if _h(x.left.left) < _h(x.left.right):
+            x.left = _rotate_left(x.left)
+        return _rotate_right(x)
+    if balance < -1:
+        if _h(x.right.right) < _h(x.right.left):
+            x.right = _rotate_right(x.right)
+        return _rotate_left(x)
+    return x
+
+class AVLTree(OrderedTreeMixin):
+    """
+    自平衡二叉搜索树 (AVL)，与 BST 保持相同的 put / get / height 接口。
+    插入、查找、删除都是迭代实现，不受递归深度限制；树高始终为 O(log n)。
+    min() / max() 直接返回缓存值，为 O(1)。
+    """
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+        self._min = None
+        self._max = None
+
+    def __len__(self):
+        return self._size
+
+    def get(self, key):
+        x = self._root
+        while x is not None:
+            if key == x.key:
+                return x.key
+            x = x.left if key < x.key else x.right
+        return None
+
+    def _relink(self, path, new_child, old_child):
+        # 把 path 末尾节点（old_child 的父节点）指向新的子树根
+        if not path:
+            self._root = new_child
+        else:
+            parent = path[-1]
+            if parent.left is old_child:
+                parent.left = new_child
+            else:
+                parent.right = new_child
+
+    def _rebalance_path(self, path):
+        # 自底向上沿插入路径重新平衡
+        while path:
+            x = path.pop()
+            old_height = x.height
+            y = _rebalance(x)
+            if y is not x:
+                self._relink(path, y, x)
+            elif y.height == old_height:
+                # 高度没变且没有旋转，祖先无需旋转，只需把子树大小加 1
+                for ancestor in path:
+                    ancestor.size += 1
+                break
+
+    # 插入元素
+    def put(self, key):
+        if self._root is None:
+            self._root = AVLNode(key)
+            self._size = 1
+            self._min = self._max = key
+            return
+        path = []
+        x = self._root
+        while x is not None:
+            if key == x.key:
+                return
+            path.append(x)
+            x = x.left if key < x.key else x.right
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = AVLNode(key)
+        else:
+            parent.right = AVLNode(key)
+        self._size += 1
+        if key < self._min:
+            self._min = key
+        if key > self._max:
+            self._max = key
+        self._rebalance_path(path)
+
+    # 删除元素，不存在时返回 False
+    def delete(self, key):
+        path = []
+        x = self._root
+        while x is not None and key != x.key:
+            path.append(x)
+            x = x.left if key < x.key else x.right
+        if x is None:
+            return False
+        if x.left is not None and x.right is not None:
+            # 有两个孩子：用后继（右子树最小值）替换，再删除后继节点
+            path.append(x)
+            succ = x.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            x.key = succ.key
+            x = succ
+        child = x.left if x.left is not None else x.right
+        self._relink(path, child, x)
+        self._size -= 1
+        # 删除时不能提前结束：高度变化会一直影响到根
+        while path:
+            y = path.pop()
+            z = _rebalance(y)
+            if z is not y:
+                self._relink(path, z, y)
+        if self._size == 0:
+            self._min = self._max = None
+        else:
+            if key == self._min:
+                self._min = self._leftmost().key
+            if key == self._max:
+                self._max = self._rightmost().key
+        return True
+
+    def _leftmost(self):
+        x = self._root
+        while x.left is not None:
+            x = x.left
+        return x
+
+    def _rightmost(self):
+        x = self._root
+        while x.right is not None:
+            x = x.right
+        return x
+
+    def min(self):
+        return self._min
+
+    def max(self):
+        return self._max
+
+    # 树的高度直接取根节点缓存的高度，O(1)
+    def height(self):
+        return _h(self._root)
+
+class MaxPQ:
+    def __init__(self):
+        self._pq = []  
+
+    def insert(self, key):
+        # 存储 -key 来模拟最大堆
+        heapq.heappush(self._pq, -key)
+
+    def contains(self, key):
+        return -key in self._pq
+    
+    # 获取最大值 (堆顶)
+    def get_max(self):
+        if not self._pq: return None
+        return -self._pq[0] 
+
+class IndexedMaxPQ:
+    """
+    带索引的最大优先队列：在 MaxPQ 的基础上维护 key -> 堆中位置 的字典。
+    contains 为 O(1)，insert / del_max / delete / change_key 为 O(log n)。
+    与 MaxPQ 一样在 heapq 的最小堆中存储 -key；键必须互不相同。
+    """
+
+    def __init__(self):
+        self._pq = []
+        self._pos = {}
+
+    # 批量建堆：一次 heapq.heapify，O(n)，而不是 n 次 push
+    @classmethod
+    def from_iterable(cls, iterable):
+        pq = cls()
+        pq._pq = [-key for key in iterable]
+        heapq.heapify(pq._pq)
+        pq._pos = {-v: i for i, v in enumerate(pq._pq)}
+        if len(pq._pos) != len(pq._pq):
+            raise ValueError("IndexedMaxPQ 中的键必须互不相同")
+        return pq
+
+    def __len__(self):
+        return len(self._pq)
+
+    def _sift_up(self, i):
+        # “空洞”上移：只在最后写一次目标位置，减少赋值次数
+        pq, pos = self._pq, self._pos
+        item = pq[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = pq[parent]
+            if item >= p:
+                break
+            pq[i] = p
+            pos[-p] = i
+            i = parent
+        pq[i] = item
+        pos[-item] = i
+
+    def _sift_down(self, i):
+        pq, pos = self._pq, self._pos
+        n = len(pq)
+        item = pq[i]
+        child = 2 * i + 1
+        while child < n:
+            right = child + 1
+            if right < n and pq[right] < pq[child]:
+                child = right
+            c = pq[child]
+            if item <= c:
+                break
+            pq[i] = c
+            pos[-c] = i
+            i = child
+            child = 2 * i + 1
+        pq[i] = item
+        pos[-item] = i
+
+    def _fix(self, i):
+        if i > 0 and self._pq[i] < self._pq[(i - 1) >> 1]:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def insert(self, key):
+        if key in self._pos:
+            raise ValueError(f"键 {key} 已在队列中")
+        self._pq.append(-key)
+        self._sift_up(len(self._pq) - 1)
+
+    # O(1) 查询：直接查位置字典，不再线性扫描堆
+    def contains(self, key):
+        return key in self._pos
+
+    # 获取最大值 (堆顶)
+    def get_max(self):
+        if not self._pq: return None
+        return -self._pq[0]
+
+    # 删除并返回最大值
+    def del_max(self):
+        if not self._pq:
+            raise IndexError("del_max from empty priority queue")
+        top = self._pq[0]
+        del self._pos[-top]
+        last = self._pq.pop()
+        if self._pq:
+            self._pq[0] = last
+            self._sift_down(0)
+        return -top
+
+    # 删除任意键，不存在时抛出 KeyError
+    def delete(self, key):
+        i = self._pos.pop(key)
+        last = self._pq.pop()
+        if i < len(self._pq):
+            self._pq[i] = last
+            self._pos[-last] = i
+            self._fix(i)
+
+    # 把 old_key 修改为 new_key，并恢复堆序
+    def change_key(self, old_key, new_key):
+        if new_key != old_key and new_key in self._pos:
+            raise ValueError(f"键 {new_key} 已在队列中")
+        i = self._pos.pop(old_key)
+        self._pq[i] = -new_key
+        self._pos[new_key] = i
+        self._fix(i)
+
+    # 先插入 key 再弹出最大值；key 不小于当前最大值时直接返回，不动堆
+    def pushpop(self, key):
+        if key in self._pos:
+            raise ValueError(f"键 {key} 已在队列中")
+        if not self._pq or key >= -self._pq[0]:
+            return key
+        top = -self._pq[0]
+        del self._pos[top]
+        self._pq[0] = -key
+        self._sift_down(0)
+        return top
+
+    # 先弹出最大值再插入 key：只做一次下沉
+    def replace(self, key):
+        if not self._pq:
+            raise IndexError("replace on empty priority queue")
+        top = -self._pq[0]
+        if key != top and key in self._pos:
+            raise ValueError(f"键 {key} 已在队列中")
+        del self._pos[top]
+        self._pq[0] = -key
+        self._sift_down(0)
+        return top
+
+class ReadWriteLock:
+    """读写锁：允许多个读者并发，写者独占；有写者等待时阻塞新的读者，避免写者饥饿。"""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+class ConcurrentTree:
+    """线程安全的搜索树包装：查询走读锁，修改走写锁。默认包装 AVLTree。"""
+
+    def __init__(self, tree=None):
+        self._tree = tree if tree is not None else AVLTree()
+        self._lock = ReadWriteLock()
+
+    def get(self, key):
+        with self._lock.read_locked():
+            return self._tree.get(key)
+
+    def put(self, key):
+        with self._lock.write_locked():
+            self._tree.put(key)
+
+    def delete(self, key):
+        with self._lock.write_locked():
+            return self._tree.delete(key)
+
+    def rank(self, key):
+        with self._lock.read_locked():
+            return self._tree.rank(key)
+
+    def size(self):
+        with self._lock.read_locked():
+            return self._tree.size()
+
+    def height(self):
+        with self._lock.read_locked():
+            return self._tree.height()
+
+class ConcurrentMaxPQ:
+    """
+    线程安全的最大优先队列，批量插入：
+    每个线程先把键写入自己的缓冲区（deque，append 本身线程安全，不加锁），
+    缓冲区满 batch_size 个后才加锁一次性并入堆；读操作前先清空所有缓冲区。
+    线程结束后它的缓冲区在下一次清空时被移除，线程池反复创建线程也不会让缓冲区列表无限增长。
+    """
+
+    def __init__(self, batch_size=256):
+        self._pq = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buffers = []  # (所属线程, 缓冲区)
+        self._batch_size = batch_size
+
+    def _buffer(self):
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            buf = deque()
+            self._local.buf = buf
+            with self._lock:
+                self._buffers.append((threading.current_thread(), buf))
+        return buf
+
+    def _drain(self, buf):
+        # 调用者需持有 self._lock；popleft 与其它线程的 append 可以安全交错
+        pq = self._pq
+        for _ in range(len(buf)):
+            heapq.heappush(pq, buf.popleft())
+
+    def _drain_all(self):
+        # 调用者需持有 self._lock；已结束的线程不会再写入，清空后即可丢弃它的缓冲区
+        for _, buf in self._buffers:
+            self._drain(buf)
+        self._buffers = [(t, buf) for t, buf in self._buffers if t.is_alive()]
+
+    def insert(self, key):
+        buf = self._buffer()
+        buf.append(-key)
+        if len(buf) >= self._batch_size:
+            with self._lock:
+                self._drain(buf)
+
+    # 把所有线程缓冲区中的键并入堆
+    def flush(self):
+        with self._lock:
+            self._drain_all()
+
+    def get_max(self):
+        with self._lock:
+            self._drain_all()
+            if not self._pq: return None
+            return -self._pq[0]
+
+    def del_max(self):
+        with self._lock:
+            self._drain_all()
+            if not self._pq:
+                raise IndexError("del_max from empty priority queue")
+            return -heapq.heappop(self._pq)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pq) + sum(len(buf) for _, buf in self._buffers)
+
+class LockedMaxPQ(MaxPQ):
+    """对照组：每次 insert 都获取一把全局锁的 MaxPQ。"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def insert(self, key):
+        with self._lock:
+            super().insert(key)
+
+    def get_max(self):
+        with self._lock:
+            return super().get_max()
+
+def thread_ingest_benchmark(workers_list=(1, 2, 4, 8), n_ops=200000, read_ratio=0.9):
+    """用 ThreadPoolExecutor 驱动并发插入 / 查询，返回各并发度下的吞吐量 (ops/s)。"""
+    results = []
+    keys = list(range(n_ops))
+    random.shuffle(keys)
+    for workers in workers_list:
+        parts = [keys[i::workers] for i in range(workers)]
+        row = {'workers': workers}
+
+        for name, factory in (("LockedMaxPQ", LockedMaxPQ), ("ConcurrentMaxPQ", ConcurrentMaxPQ)):
+            pq = factory()
+
+            def produce(part):
+                insert = pq.insert
+                for k in part:
+                    insert(k)
+
+            start = timeit.default_timer()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(produce, parts))
+            pq.get_max()
+            row[name] = n_ops / (timeit.default_timer() - start)
+
+        # 读多写少：read_ratio 比例的 get，其余为 put
+        for name, tree in (("Lock+AVL", None), ("RWLock+AVL", ConcurrentTree())):
+            if tree is None:
+                base, lock = AVLTree(), threading.Lock()
+
+                def op(k, is_read):
+                    with lock:
+                        return base.get(k) if is_read else base.put(k)
+            else:
+                def op(k, is_read, tree=tree):
+                    return tree.get(k) if is_read else tree.put(k)
+
+            def mixed(part):
+                rng = random.Random(part[0] if part else 0)
+                for k in part:
+                    op(k, rng.random() < read_ratio)
+
+            start = timeit.default_timer()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(mixed, parts))
+            row[name] = n_ops / (timeit.default_timer() - start)
+        results.append(row)
+    return results
+
+async def _async_ingest(producers, n_ops, batch):
+    queue = asyncio.Queue(maxsize=4 * batch)
+    pq = ConcurrentMaxPQ(batch_size=batch)
+    per_producer = n_ops // producers
+
+    async def produce(pid):
+        for i in range(per_producer):
+            await queue.put(pid * per_producer + i)
+        await queue.put(None)
+
+    async def consume():
+        done = 0
+        while done < producers:
+            key = await queue.get()
+            if key is None:
+                done += 1
+            else:
+                pq.insert(key)
+
+    await asyncio.gather(consume(), *(produce(p) for p in range(producers)))
+    pq.flush()
+    return len(pq)
+
+def async_ingest_benchmark(producers_list=(1, 2, 4, 8), n_ops=100000, batch=256):
+    """asyncio 生产者 / 消费者：多个生产者协程经 asyncio.Queue 向一个消费者投递键。"""
+    results = []
+    for producers in producers_list:
+        start = timeit.default_timer()
+        count = asyncio.run(_async_ingest(producers, n_ops, batch))
+        results.append({'producers': producers, 'ops_per_s': count / (timeit.default_timer() - start)})
+    return results
+
+#  Benchmark Harness 
+
+def _bst_max(tree):
+    n = tree.size()
+    return tree.select(n - 1) if n else None
+
+def _bst_put_all(cls):
+    def build(keys):
+        tree = cls()
+        for k in keys:
+            tree.put(k)
+        return tree
+    return build
+
+def _pq_insert_all(cls):
+    def build(keys):
+        pq = cls()
+        for k in keys:
+            pq.insert(k)
+        return pq
+    return build
+
+def _pq_delete(pq, key):
+    try:
+        pq.delete(key)
+    except KeyError:
+        pass
+
+# 每种结构：build(keys) 以及支持的操作；未列出的操作在混合负载中跳过
+STRUCTURES = {
+    'BST': {'build': _bst_put_all(BST),
+            'ops': {'insert': BST.put, 'get': BST.get, 'max': _bst_max}},
+    'BST.from_sorted': {'build': lambda keys: BST.from_sorted(sorted(keys)),
+                        'ops': {'insert': BST.put, 'get': BST.get, 'max': _bst_max}},
+    'AVL': {'build': _bst_put_all(AVLTree),
+            'ops': {'insert': AVLTree.put, 'get': AVLTree.get, 'max': AVLTree.max,
+                    'delete': AVLTree.delete}},
+    'Eytzinger': {'build': lambda keys: EytzingerBST.from_sorted(sorted(keys)),
+                  'ops': {'get': EytzingerBST.get}},
+    'MaxPQ': {'build': _pq_insert_all(MaxPQ),
+              'ops': {'insert': MaxPQ.insert, 'get': MaxPQ.contains, 'max': MaxPQ.get_max}},
+    'IndexedMaxPQ': {'build': IndexedMaxPQ.from_iterable,
+                     'ops': {'insert': IndexedMaxPQ.insert, 'get': IndexedMaxPQ.contains,
+                             'max': IndexedMaxPQ.get_max, 'delete': _pq_delete}},
+    'ConcurrentTree': {'build': _bst_put_all(ConcurrentTree),
+                       'ops': {'insert': ConcurrentTree.put, 'get': ConcurrentTree.get,
+                               'delete': ConcurrentTree.delete}},
+    'ConcurrentMaxPQ': {'build': _pq_insert_all(ConcurrentMaxPQ),
+                        'ops': {'insert': ConcurrentMaxPQ.insert, 'max': ConcurrentMaxPQ.get_max}},
+}
+
+DISTRIBUTIONS = ('shuffled', 'sorted', 'zipf')
+
+def make_keys(n, distribution, rng):
+    """
+    生成建树用的 n 个不同的键（偶数）、供 insert 使用的新键（奇数），以及访问键的采样函数。
+    shuffled / sorted：键按乱序 / 升序到达，访问均匀分布；
+    zipf：键乱序到达，访问服从 Zipf(s=1.1)，少数热点键被频繁访问。
+    新键与已有键交错分布，避免插入总落在最右侧使 BST 退化。
+    """
+    keys = list(range(0, 2 * n, 2))
+    fresh = list(range(1, 2 * n, 2))
+    if distribution == 'sorted':
+        pass
+    elif distribution in ('shuffled', 'zipf'):
+        rng.shuffle(keys)
+        rng.shuffle(fresh)
+    else:
+        raise ValueError(f"未知的分布: {distribution}")
+
+    if distribution == 'zipf':
+        cum = []
+        total = 0.0
+        for rank in range(1, n + 1):
+            total += 1.0 / rank ** 1.1
+            cum.append(total)
+        return keys, fresh, lambda k: rng.choices(keys, cum_weights=cum, k=k)
+    return keys, fresh, lambda k: [keys[rng.randrange(n)] for _ in range(k)]
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    samples.sort()
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {'count': len(samples), 'p50_ns': pick(0.50), 'p90_ns': pick(0.90),
+            'p99_ns': pick(0.99), 'max_ns': samples[-1]}
+
+def run_benchmark(structure, n, distribution='shuffled', mix=None, ops=10000, seed=0):
+    """
+    对一种结构运行：建树（耗时与 tracemalloc 峰值内存），再执行按 mix 比例混合的 ops 次操作，
+    返回可直接序列化为 JSON 的结果字典（各操作的延迟分位数以纳秒为单位）。
+    """
+    spec = STRUCTURES[structure]
+    mix = mix or {'get': 1.0}
+    rng = random.Random(seed)
+    keys, fresh, sample_keys = make_keys(n, distribution, rng)
+
+    # tracemalloc 会拖慢分配，因此内存与建树时间分开测量
+    tracemalloc.start()
+    spec['build'](keys)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter_ns()
+    obj = spec['build'](keys)
+    build_ns = time.perf_counter_ns() - start
+
+    supported = {op: w for op, w in mix.items() if op in spec['ops'] and w > 0}
+    names = list(supported)
+    plan = rng.choices(names, weights=[supported[op] for op in names], k=ops) if names else []
+    targets = sample_keys(len(plan))
+    fresh = iter(fresh)  # insert 使用新键，保证对索引优先队列也合法
+    next_key = 2 * n     # 新键用完后再从 2n 开始递增
+    samples = {op: [] for op in names}
+    perf = time.perf_counter_ns
+    for op, key in zip(plan, targets):
+        func = spec['ops'][op]
+        if op == 'insert':
+            key = next(fresh, None)
+            if key is None:
+                key = next_key
+                next_key += 1
+        if op == 'max':
+            t0 = perf()
+            func(obj)
+            samples[op].append(perf() - t0)
+        else:
+            t0 = perf()
+            func(obj, key)
+            samples[op].append(perf() - t0)
+
+    height = obj.height() if hasattr(obj, 'height') else None
+    return {
+        'structure': structure,
+        'n': n,
+        'distribution': distribution,
+        'mix': mix,
+        'unsupported_ops': sorted(op for op in mix if op not in spec['ops']),
+        'build_ns': build_ns,
+        'peak_memory_bytes': peak,
+        'height': height,
+        'latency': {op: _percentiles(samples[op]) for op in names},
+    }
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        op, _, weight = part.partition('=')
+        mix[op.strip()] = float(weight) if weight else 1.0
+    return mix
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="BST / MaxPQ 数据结构基准测试")
+    parser.add_argument("--structures", nargs="+", default=['BST', 'AVL', 'MaxPQ', 'IndexedMaxPQ'],
+                        choices=list(STRUCTURES))
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--distribution", default='shuffled', choices=DISTRIBUTIONS)
+    parser.add_argument("--mix", default="get=0.7,max=0.1,insert=0.1,delete=0.1",
+                        help="操作比例，例如 get=0.7,max=0.1,insert=0.1,delete=0.1")
+    parser.add_argument("--ops", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="把结果写入 JSON 文件（默认输出到标准输出）")
+    parser.add_argument("--concurrency", action="store_true",
+                        help="同时运行线程池与 asyncio 并发写入基准")
+    args = parser.parse_args()
+
+    report = {'runs': [run_benchmark(name, args.n, args.distribution, _parse_mix(args.mix),
+                                     args.ops, args.seed)
+                       for name in args.structures]}
+    if args.concurrency:
+        report['thread_ingest'] = thread_ingest_benchmark()
+        report['async_ingest'] = async_ingest_benchmark()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)